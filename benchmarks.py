@@ -0,0 +1,215 @@
+"""
+Engine benchmarks for the Enhanced Maze Game
+Times maze generation and the per-frame MazeGame work (raycasting, fog of
+war, minimap, collision) headlessly with fixed seeds and poses, and compares
+each run against a JSON baseline
+"""
+
+import os
+
+# Must be set before pygame opens a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from maze_generator import MAZE_SIZES, MazeGenerator
+
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 0.20  # 20% slower than baseline counts as a regression
+POSES_PER_MAZE = 50
+BENCHMARK_SEED = 1234
+
+
+def _time_per_call(function: Callable[[], None], calls: int, repeat: int) -> Dict[str, float]:
+    """Run a batch of calls repeat times; report per-call median and best in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000 / calls)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples)}
+
+
+def fixed_poses(maze: List[str], tile_size: float, count: int = POSES_PER_MAZE, seed: int = BENCHMARK_SEED):
+    """Pick reproducible (x, y, angle) player poses at floor tile centres"""
+    rng = random.Random(seed)
+    floor = [(x, y) for y, row in enumerate(maze) for x, cell in enumerate(row) if cell != '#']
+    tiles = [floor[rng.randrange(len(floor))] for _ in range(count)]
+    return [((x + 0.5) * tile_size, (y + 0.5) * tile_size, rng.uniform(0, 2 * math.pi)) for x, y in tiles]
+
+
+def bench_generation(repeat: int = 5, sizes: Dict[str, tuple] = None) -> Dict[str, Dict[str, float]]:
+    """Time MazeGenerator at each size tier"""
+    results = {}
+    for name, (width, height) in (sizes or MAZE_SIZES).items():
+        seeds = range(BENCHMARK_SEED, BENCHMARK_SEED + 5)
+
+        def generate():
+            for seed in seeds:
+                MazeGenerator(width, height, seed=seed)
+
+        results[f"generate/{name}"] = _time_per_call(generate, len(seeds), repeat)
+    return results
+
+
+def bench_frame(repeat: int = 5, sizes: Dict[str, tuple] = None) -> Dict[str, Dict[str, float]]:
+    """Time the per-frame MazeGame work on a fixed maze per size tier"""
+    from maze_game import MazeGame, PLAYER_SPEED
+
+    game = MazeGame()
+    game.show_minimap = True
+    results = {}
+    for name, (width, height) in (sizes or MAZE_SIZES).items():
+        game.load_maze(MazeGenerator(width, height, seed=BENCHMARK_SEED).get_maze())
+        poses = fixed_poses(game.MAP, game.TILE_SIZE)
+
+        def at_each_pose(step):
+            def run():
+                for x, y, angle in poses:
+                    game.player_x, game.player_y, game.player_angle = x, y, angle
+                    step(angle)
+            return run
+
+        def collide(angle):
+            # One tick's step forward, as apply_controls moves, with wall sliding when blocked
+            game.move_player(game.player_x - math.sin(angle) * PLAYER_SPEED,
+                             game.player_y + math.cos(angle) * PLAYER_SPEED)
+
+        steps = {
+            "cast_rays": lambda angle: game.cast_rays(),
+            "update_explored_tiles": lambda angle: game.update_explored_tiles(),
+            "draw_map": lambda angle: game.draw_map(),
+            "collision": collide
+        }
+        # Fog of war drawn over a fully explored map is the worst case
+        at_each_pose(steps["update_explored_tiles"])()
+
+        for step_name, step in steps.items():
+            results[f"{step_name}/{name}"] = _time_per_call(at_each_pose(step), len(poses), repeat)
+    return results
+
+
+def run_benchmarks(repeat: int = 5, only: List[str] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run every benchmark
+
+    Args:
+        repeat: Timed batches per benchmark (the median is compared)
+        only: Benchmark name prefixes to keep, e.g. ["generate", "cast_rays"]
+
+    Returns:
+        Dictionary of benchmark name to per-call timings in milliseconds
+    """
+    results = {}
+    if not only or any(prefix.startswith("generate") for prefix in only):
+        results.update(bench_generation(repeat))
+    if not only or any(not prefix.startswith("generate") for prefix in only):
+        results.update(bench_frame(repeat))
+    if only:
+        results = {name: value for name, value in results.items() if any(name.startswith(p) for p in only)}
+    return results
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict,
+                        threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Compare results with a baseline
+
+    Per-benchmark thresholds can be stored in the baseline under
+    "thresholds", keyed by benchmark name or name prefix (e.g. "draw_map").
+
+    Returns:
+        One message per regression (empty if none)
+    """
+    thresholds = baseline.get("thresholds", {})
+    regressions = []
+    for name, timing in sorted(results.items()):
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        limit = _threshold_for(name, thresholds, threshold)
+        change = timing["median_ms"] / previous["median_ms"] - 1
+        if change > limit:
+            regressions.append(f"{name}: {previous['median_ms']:.3f}ms -> {timing['median_ms']:.3f}ms "
+                               f"(+{change * 100:.0f}%, limit +{limit * 100:.0f}%)")
+    return regressions
+
+
+def _threshold_for(name: str, thresholds: Dict[str, float], default: float) -> float:
+    if name in thresholds:
+        return thresholds[name]
+    prefix = name.split("/")[0]
+    return thresholds.get(prefix, default)
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    """Read a baseline file, or None if there isn't one"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]], previous: Optional[Dict] = None):
+    """Write results as the new baseline, keeping any configured thresholds"""
+    baseline = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "thresholds": (previous or {}).get("thresholds", {}),
+        "results": results
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Maze engine benchmarks")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="Write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a benchmark counts as regressed (0.2 = 20%%)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per benchmark")
+    parser.add_argument("--only", help="Comma-separated benchmark name prefixes")
+    args = parser.parse_args(argv)
+
+    only = args.only.split(",") if args.only else None
+    results = run_benchmarks(args.repeat, only)
+    baseline = load_baseline(args.baseline)
+
+    print(f"{'Benchmark':<32}{'Median':>12}{'Best':>12}{'Baseline':>12}")
+    for name, timing in sorted(results.items()):
+        previous = (baseline or {}).get("results", {}).get(name)
+        before = f"{previous['median_ms']:.3f}ms" if previous else "-"
+        print(f"{name:<32}{timing['median_ms']:>10.3f}ms{timing['min_ms']:>10.3f}ms{before:>12}")
+
+    if args.save:
+        save_baseline(args.baseline, results, baseline)
+        print(f"✅ Saved baseline to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save to create one")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print("❌ Regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -81,16 +81,20 @@ class ChatInterface:
         
         try:
             message = self.input_text.strip()
+            sent = None
             
             if self.chat_type == "friend" and self.current_friend_id:
-                self.db_handler.send_friend_message(self.current_friend_id, message)
+                sent = self.db_handler.send_friend_message(self.current_friend_id, message)
             elif self.chat_type == "game":
-                self.db_handler.send_game_message(message)
+                sent = self.db_handler.send_game_message(message)
             elif self.chat_type == "global":
-                self.db_handler.send_global_message(message)
+                sent = self.db_handler.send_global_message(message)
             
             self.input_text = ""
-            self.refresh_messages()
+            # Sends finish in the background; show the message now and let
+            # the next refresh replace it with the stored copy
+            if sent:
+                self.messages.append(sent)
             
         except Exception as e:
             print(f"Error sending message: {e}")
@@ -183,13 +187,13 @@ class ChatInterface:
         # Draw messages
         if self.messages:
             visible_messages = self.messages[-10:]  # Show last 10 messages
+            current_user = self.db_handler.get_current_user()
             for i, message in enumerate(visible_messages):
                 y_pos = message_y + (i * 15)
                 if y_pos > message_area_height:
                     break
                 
                 # Determine message color and prefix
-                current_user = self.db_handler.get_current_user()
                 is_my_message = current_user and message['sender_id'] == current_user['id']
                 
                 if is_my_message:
@@ -297,9 +301,11 @@ class FriendChatWindow:
             return
         
         try:
-            self.db_handler.send_friend_message(self.selected_friend, self.input_text.strip())
+            sent = self.db_handler.send_friend_message(self.selected_friend, self.input_text.strip())
             self.input_text = ""
-            self.current_messages = self.db_handler.get_friend_messages(self.selected_friend)
+            # Sent in the background: show it now rather than re-fetching too early
+            if sent:
+                self.current_messages.append(sent)
         except Exception as e:
             print(f"Error sending friend message: {e}")
     
@@ -397,10 +403,10 @@ class FriendChatWindow:
         if self.selected_friend and self.current_messages:
             # Draw messages
             visible_messages = self.current_messages[-8:]  # Show last 8 messages
+            current_user = self.db_handler.get_current_user()
             for i, message in enumerate(visible_messages):
                 y_pos = self.window_y + 30 + (i * 25)
                 
-                current_user = self.db_handler.get_current_user()
                 is_my_message = current_user and message['sender_id'] == current_user['id']
                 
                 prefix = "You: " if is_my_message else f"{message['sender_name']}: "
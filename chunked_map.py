@@ -0,0 +1,259 @@
+"""
+Chunked on-disk maps for the Enhanced Maze Game
+Huge mazes are stored as fixed-size bit-packed chunks and read through mmap,
+so only the chunks around the player are ever decoded
+"""
+
+import json
+import mmap
+import struct
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from maze_generator import maze_to_grid
+
+MAGIC = b"MZCH"
+VERSION = 1
+DEFAULT_CHUNK_SIZE = 32
+
+# magic, version, width, height, chunk size, metadata offset, metadata length
+_HEADER = struct.Struct(">4sBIIHQI")
+
+
+def _rows_from(maze) -> Iterable[np.ndarray]:
+    """Yield boolean wall rows from a grid, a list of strings or any iterable of rows"""
+    if isinstance(maze, np.ndarray):
+        yield from maze.astype(bool, copy=False)
+        return
+    for row in maze:
+        if isinstance(row, np.ndarray):
+            yield row.astype(bool, copy=False)
+        else:
+            yield maze_to_grid([row])[0]
+
+
+def write_chunked_map(path: str, maze, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      metadata: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Write a maze to a chunked map file
+
+    Rows are consumed one band of chunk_size rows at a time, so the maze can
+    be streamed from a generator without ever being held in memory whole.
+
+    Args:
+        path: Output file path
+        maze: Boolean wall grid, list of strings or iterable of rows
+        chunk_size: Chunk edge length in tiles (power of two, 8-256)
+        metadata: Extra JSON-serializable values to store (e.g. difficulty)
+
+    Returns:
+        The metadata written to the file
+    """
+    if chunk_size < 8 or chunk_size > 256 or chunk_size & (chunk_size - 1):
+        raise ValueError("Chunk size must be a power of two between 8 and 256")
+
+    width = None
+    height = 0
+    band = None
+    band_rows = 0
+    floor_tiles = 0
+    spawn = None
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, 0, chunk_size, 0, 0))
+
+        def flush_band():
+            nonlocal floor_tiles, spawn
+            floor_tiles += int(np.count_nonzero(~band[:band_rows, :width]))
+            if spawn is None:
+                spawn = _find_band_spawn(band[:band_rows, :width], height - band_rows)
+            # Chunks in a band are stored left to right
+            chunks_x = band.shape[1] // chunk_size
+            for chunk in band.reshape(chunk_size, chunks_x, chunk_size).swapaxes(0, 1):
+                f.write(np.packbits(chunk, axis=None).tobytes())
+            band[:] = True  # Padding past the last row or column is wall
+
+        for row in _rows_from(maze):
+            if width is None:
+                width = len(row)
+                band = np.ones((chunk_size, -(-width // chunk_size) * chunk_size), dtype=bool)
+            elif len(row) != width:
+                raise ValueError(f"Row {height} has width {len(row)}, expected {width}")
+
+            band[band_rows, :width] = row
+            band_rows += 1
+            height += 1
+            if band_rows == chunk_size:
+                flush_band()
+                band_rows = 0
+
+        if width is None:
+            raise ValueError("Cannot write an empty maze")
+        if band_rows:
+            flush_band()
+
+        info = dict(metadata or {})
+        info.update({"floor_tiles": floor_tiles, "spawn": spawn})
+        encoded = json.dumps(info).encode("utf-8")
+        metadata_offset = f.tell()
+        f.write(encoded)
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, width, height, chunk_size, metadata_offset, len(encoded)))
+
+    return info
+
+
+def _find_band_spawn(band: np.ndarray, first_row: int) -> Optional[List[int]]:
+    """Spawn rule from maze_analysis.find_spawn, applied to the first band that has floor"""
+    height, width = band.shape
+    if first_row == 0:
+        for y in range(1, min(5, height - 1)):
+            for x in range(1, min(5, width - 1)):
+                if not band[y, x]:
+                    return [x, y]
+    floor = np.argwhere(~band)
+    if floor.size:
+        return [int(floor[0][1]), int(floor[0][0]) + first_row]
+    return None
+
+
+class ChunkedMap:
+    """
+    Read-only view of a chunked map file
+
+    Chunks are decoded on first touch and kept in a small LRU cache, so
+    memory stays proportional to the area around the player rather than
+    the size of the maze. The file itself is mapped, not read.
+    """
+
+    def __init__(self, path: str, cache_chunks: int = 64):
+        self.path = path
+        self.cache_chunks = cache_chunks
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, width, height, chunk_size, metadata_offset, metadata_length = \
+            _HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a chunked map file")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"Unsupported chunked map version {version}")
+
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.metadata = json.loads(self._mmap[metadata_offset:metadata_offset + metadata_length])
+        self.floor_tiles = self.metadata["floor_tiles"]
+        self.spawn = self.metadata["spawn"]
+
+        self._shift = chunk_size.bit_length() - 1
+        self._mask = chunk_size - 1
+        self._chunks_x = -(-width // chunk_size)
+        self._chunk_bytes = -(-chunk_size * chunk_size // 8)
+        self._data_offset = _HEADER.size
+
+        self._cache = OrderedDict()
+        self._last_key = None
+        self._last_chunk = None
+        self.chunk_loads = 0
+
+    def close(self):
+        """Release the mapping and the file"""
+        self._cache.clear()
+        self._last_key = self._last_chunk = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def chunk(self, chunk_x: int, chunk_y: int) -> List[List[int]]:
+        """Return a decoded chunk as rows of 0/1 (1 = wall)"""
+        key = (chunk_x, chunk_y)
+        chunk = self._cache.get(key)
+        if chunk is not None:
+            self._cache.move_to_end(key)
+            return chunk
+
+        start = self._data_offset + (chunk_y * self._chunks_x + chunk_x) * self._chunk_bytes
+        packed = np.frombuffer(self._mmap, dtype=np.uint8, count=self._chunk_bytes, offset=start)
+        bits = np.unpackbits(packed, count=self.chunk_size * self.chunk_size)
+        chunk = bits.reshape(self.chunk_size, self.chunk_size).tolist()
+        self.chunk_loads += 1
+
+        self._cache[key] = chunk
+        if len(self._cache) > self.cache_chunks:
+            self._cache.popitem(last=False)
+        return chunk
+
+    def is_wall(self, col: int, row: int) -> bool:
+        """Check a tile; anything outside the map counts as wall"""
+        if not (0 <= col < self.width and 0 <= row < self.height):
+            return True
+
+        key = (col >> self._shift, row >> self._shift)
+        # Rays and sweeps stay in one chunk for many lookups in a row
+        if key != self._last_key:
+            self._last_chunk = self.chunk(*key)
+            self._last_key = key
+        return self._last_chunk[row & self._mask][col & self._mask] == 1
+
+    def read_region(self, col: int, row: int, width: int, height: int) -> np.ndarray:
+        """Read a rectangle of tiles as a boolean wall grid (outside the map is wall)"""
+        region = np.ones((height, width), dtype=bool)
+        first_cx, first_cy = max(0, col) >> self._shift, max(0, row) >> self._shift
+        last_cx = min(self.width - 1, col + width - 1) >> self._shift
+        last_cy = min(self.height - 1, row + height - 1) >> self._shift
+
+        for cy in range(first_cy, last_cy + 1):
+            for cx in range(first_cx, last_cx + 1):
+                chunk = np.array(self.chunk(cx, cy), dtype=bool)
+                x0, y0 = cx * self.chunk_size, cy * self.chunk_size
+                # Overlap of the chunk and the requested rectangle, in map coordinates
+                left, top = max(col, x0), max(row, y0)
+                right = min(col + width, x0 + self.chunk_size, self.width)
+                bottom = min(row + height, y0 + self.chunk_size, self.height)
+                if left < right and top < bottom:
+                    region[top - row:bottom - row, left - col:right - col] = \
+                        chunk[top - y0:bottom - y0, left - x0:right - x0]
+        return region
+
+    @property
+    def loaded_chunks(self) -> int:
+        """Number of decoded chunks currently cached"""
+        return len(self._cache)
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    from maze_generator import MazeGenerator
+
+    size = 1001
+    print(f"Generating a {size}x{size} maze...")
+    generator = MazeGenerator(size, size, seed=7)
+    grid = generator.get_grid()
+
+    path = os.path.join(tempfile.gettempdir(), "chunked_map_demo.mzc")
+    start = time.perf_counter()
+    write_chunked_map(path, grid)
+    print(f"Wrote {os.path.getsize(path)} bytes in {time.perf_counter() - start:.2f}s")
+
+    with ChunkedMap(path, cache_chunks=16) as chunked:
+        assert np.array_equal(chunked.read_region(0, 0, size, size), grid)
+        assert all(chunked.is_wall(x, y) == grid[y, x] for y in range(0, size, 37) for x in range(0, size, 41))
+        print(f"Verified; {chunked.loaded_chunks} chunks cached after {chunked.chunk_loads} loads")
+    os.remove(path)
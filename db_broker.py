@@ -0,0 +1,312 @@
+"""
+Local database broker for the Enhanced Maze Game
+One process owns the authenticated GameSupabaseHandler; the menu, the game
+and the chat windows call it over a Unix socket, so sign-in and connection
+setup happen once per machine session and identical reads are shared
+"""
+
+import argparse
+import functools
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Set, Tuple
+
+from game_ipc import read_message, write_message
+from supabase_handler import GameSupabaseHandler
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".maze_game", "db_broker.sock")
+
+# Set to "1" (default socket) or a socket path to use a running broker
+BROKER_ENV = "MAZE_DB_BROKER"
+
+# Seconds a read result is reused for identical calls
+READ_CACHE_TTL = 1.0
+
+# Handler methods that only read: cached, and concurrent identical calls share
+# one request. Everything else is a write and goes through the write queue.
+READ_PREFIXES = ("get_", "is_")
+
+# Handler methods that act on the local process rather than the database
+LOCAL_METHODS = {"connect", "is_connected"}
+
+
+class BrokerError(Exception):
+    """A call failed inside the broker"""
+
+
+def broker_methods() -> Set[str]:
+    """Public GameSupabaseHandler methods the broker serves"""
+    return {name for name, value in vars(GameSupabaseHandler).items()
+            if callable(value) and not name.startswith("_") and name not in LOCAL_METHODS}
+
+
+class DBBroker:
+    """
+    Serves one GameSupabaseHandler to local processes
+
+    Reads are cached for cache_ttl seconds, and a read already in flight is
+    shared with everyone asking for the same thing. Writes run one at a time
+    on a writer thread, in arrival order, and clear the read cache.
+    """
+
+    def __init__(self, handler: GameSupabaseHandler, path: str = DEFAULT_SOCKET_PATH,
+                 cache_ttl: float = READ_CACHE_TTL):
+        self.handler = handler
+        self.path = path
+        self.cache_ttl = cache_ttl
+        self.methods = broker_methods()
+        self.stats = {"calls": 0, "cache_hits": 0, "coalesced": 0, "writes": 0}
+
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="DBBrokerWriter", daemon=True)
+        self._writer.start()
+        self.server = None
+
+    def call(self, method: str, args: list, kwargs: dict) -> Any:
+        """Run one handler method for a client"""
+        if method not in self.methods:
+            raise AttributeError(f"Broker has no method '{method}'")
+        with self._lock:
+            self.stats["calls"] += 1
+        if method.startswith(READ_PREFIXES):
+            return self._read(method, args, kwargs)
+        future = Future()
+        self._writes.put((method, args, kwargs, future))
+        return future.result()
+
+    def _read(self, method: str, args: list, kwargs: dict) -> Any:
+        key = json.dumps([method, args, kwargs], sort_keys=True, default=str)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < self.cache_ttl:
+                self.stats["cache_hits"] += 1
+                return cached[1]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+                generation = self._generation
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return future.result()
+
+        try:
+            result = getattr(self.handler, method)(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            # A write that finished meanwhile may have made this stale
+            if generation == self._generation:
+                self._cache[key] = (time.monotonic(), result)
+        future.set_result(result)
+        return result
+
+    def _write_loop(self):
+        while True:
+            method, args, kwargs, future = self._writes.get()
+            try:
+                future.set_result(getattr(self.handler, method)(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+            with self._lock:
+                self.stats["writes"] += 1
+                self._generation += 1
+                self._cache.clear()
+
+    def serve_forever(self):
+        """Listen on the socket until shutdown() (or Ctrl+C)"""
+        if os.path.exists(self.path):
+            if _broker_listening(self.path):
+                raise RuntimeError(f"A broker is already running at {self.path}")
+            os.remove(self.path)  # Left over from a broker that didn't shut down cleanly
+        os.makedirs(os.path.dirname(self.path) or ".", mode=0o700, exist_ok=True)
+
+        # The socket acts as the signed-in user: create it owner-only (0600)
+        # rather than restricting it after it is already reachable
+        old_umask = os.umask(0o177)
+        try:
+            self.server = _BrokerServer(self.path, _BrokerRequestHandler)
+        finally:
+            os.umask(old_umask)
+        self.server.broker = self
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _BrokerServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _BrokerServer = None
+
+
+class _BrokerRequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: {"method", "args", "kwargs"} in, {"ok", "result" or "error"} out"""
+
+    def handle(self):
+        broker = self.server.broker
+        while True:
+            try:
+                request = read_message(self.rfile)
+            except (EOFError, OSError, ValueError):
+                return
+            try:
+                result = broker.call(request["method"], request.get("args", []), request.get("kwargs", {}))
+                response = {"ok": True, "result": result}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                write_message(self.wfile, response)
+            except OSError:
+                return
+
+
+def _broker_listening(path: str) -> bool:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+class BrokerClient:
+    """
+    Stand-in for GameSupabaseHandler that forwards method calls to a DBBroker
+
+    Each thread gets its own connection, so a slow call on one thread
+    doesn't hold up another. Only methods are forwarded: code that needs the
+    raw client (handler.supabase, e.g. MazeCatalog) needs a direct handler.
+    """
+
+    def __init__(self, path: str = DEFAULT_SOCKET_PATH, lazy: bool = False):
+        self.path = path
+        self.methods = broker_methods()
+        self._local = threading.local()
+        if not lazy:
+            self.connect()
+
+    def connect(self) -> "BrokerClient":
+        """Open this thread's connection to the broker if it isn't open yet"""
+        if getattr(self._local, "sock", None) is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            self._local.sock = sock
+            self._local.reader = sock.makefile("rb")
+            self._local.writer = sock.makefile("wb")
+        return self
+
+    def is_connected(self) -> bool:
+        return getattr(self._local, "sock", None) is not None
+
+    def _disconnect(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call a handler method in the broker
+
+        Raises:
+            BrokerError: The method raised inside the broker
+            OSError: The broker can't be reached
+        """
+        request = {"method": method, "args": list(args), "kwargs": kwargs}
+        for attempt in range(2):
+            try:
+                self.connect()
+                write_message(self._local.writer, request)
+                response = read_message(self._local.reader)
+                break
+            except (OSError, EOFError) as e:
+                # The broker may have restarted; reconnect once
+                self._disconnect()
+                if attempt:
+                    raise OSError(f"Database broker unavailable: {e}") from e
+        if not response["ok"]:
+            raise BrokerError(response["error"])
+        return response["result"]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name not in self.__dict__.get("methods", ()):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return functools.partial(self.call, name)
+
+
+def open_db_handler(lazy: bool = False):
+    """
+    Database handler for this process
+
+    A BrokerClient if MAZE_DB_BROKER is set ("1" for the default socket, or
+    a socket path) and a broker is listening there, otherwise a
+    GameSupabaseHandler of its own.
+    """
+    setting = os.environ.get(BROKER_ENV)
+    if setting and _BrokerServer is not None:
+        path = DEFAULT_SOCKET_PATH if setting == "1" else setting
+        if os.path.exists(path) and _broker_listening(path):
+            return BrokerClient(path, lazy=lazy)
+        print(f"⚠️ No database broker at {path}, connecting directly")
+    return GameSupabaseHandler(lazy=lazy)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Local database broker for the maze game")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument("--cache-ttl", type=float, default=READ_CACHE_TTL,
+                        help="Seconds identical reads are served from the cache")
+    args = parser.parse_args(argv)
+
+    if _BrokerServer is None:
+        print("❌ The database broker needs Unix socket support")
+        return 1
+
+    try:
+        broker = DBBroker(GameSupabaseHandler(), args.socket, args.cache_ttl)
+    except Exception as e:
+        print(f"❌ Database connection failed: {e}")
+        return 1
+
+    print(f"✅ Database broker listening on {args.socket}")
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"👋 Database broker stopped: {broker.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
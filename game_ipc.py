@@ -0,0 +1,220 @@
+"""
+Process messaging for the Enhanced Maze Game
+Typed, length-prefixed JSON messages over the pipes a game process inherits,
+so a separate game process gets its config, reports progress and returns its
+result without any files in the working directory
+"""
+
+import json
+import os
+import queue
+import struct
+import subprocess
+import sys
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+# Launcher -> game: "config". Game -> launcher: "ready", "progress", "result", "error".
+MESSAGE_TYPES = ("config", "ready", "progress", "result", "error")
+
+_LENGTH = struct.Struct(">I")
+
+
+def write_message(stream: BinaryIO, message: Any):
+    """Write one length-prefixed JSON message (objects JSON can't hold are sent as strings)"""
+    body = json.dumps(message, default=str).encode("utf-8")
+    stream.write(_LENGTH.pack(len(body)) + body)
+    stream.flush()
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError("Channel closed")
+        data += chunk
+    return data
+
+
+def read_message(stream: BinaryIO) -> Any:
+    """Wait for one length-prefixed JSON message; raises EOFError once the stream closes"""
+    length, = _LENGTH.unpack(_read_exact(stream, _LENGTH.size))
+    return json.loads(_read_exact(stream, length))
+
+
+class GameChannel:
+    """One end of a message channel: reads from one pipe, writes to another"""
+
+    def __init__(self, reader: BinaryIO, writer: BinaryIO):
+        self.reader = reader
+        self.writer = writer
+        self._write_lock = threading.Lock()
+
+    @classmethod
+    def for_child(cls) -> "GameChannel":
+        """
+        Channel for a game started by GameProcess
+
+        Messages use the inherited stdin and stdout; print() output is sent
+        to stderr from here on so it can't corrupt the message stream. Call
+        this before importing anything that prints (pygame does on import).
+        """
+        writer = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        return cls(sys.stdin.buffer, writer)
+
+    def send(self, kind: str, data: Any = None):
+        """Send one message"""
+        if kind not in MESSAGE_TYPES:
+            raise ValueError(f"Unknown message type '{kind}'")
+        with self._write_lock:
+            write_message(self.writer, {"type": kind, "data": data})
+
+    def recv(self) -> Tuple[str, Any]:
+        """
+        Wait for the next message
+
+        Returns:
+            (message type, data)
+        """
+        message = read_message(self.reader)
+        return message["type"], message["data"]
+
+    def close(self):
+        for stream in (self.writer, self.reader):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class GameProcess:
+    """
+    A game running in its own process, driven over a GameChannel
+
+    A reader thread collects messages, so poll() never blocks and the
+    menu can keep drawing (and show live progress) while the game runs.
+    Each process has its own pipes, so concurrent games can't clobber
+    each other's config or results.
+
+    Created without a config, the process is a warm worker: it imports
+    pygame and the engine, initializes SDL and generates its first maze,
+    then waits for start() so a game begins without any of that cost.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, script: str = None):
+        script = script or os.path.abspath(__file__)
+        self.process = subprocess.Popen([sys.executable, script],
+                                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.channel = GameChannel(self.process.stdout, self.process.stdin)
+        self.ready = False
+        self.started = False
+        self.progress: Optional[Dict[str, Any]] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+        self._messages = queue.Queue()
+        self._reader = threading.Thread(target=self._read_loop, name="GameProcessReader", daemon=True)
+        self._reader.start()
+        if config is not None:
+            self.start(config)
+
+    @property
+    def is_running(self) -> bool:
+        """True until the process has exited or sent its result"""
+        return self.result is None and self.process.poll() is None
+
+    def start(self, config: Dict[str, Any]):
+        """Hand the game its config; raises OSError if the worker has died"""
+        if self.started:
+            raise RuntimeError("Game already started")
+        self.channel.send("config", config)
+        self.started = True
+
+    def _read_loop(self):
+        try:
+            while True:
+                self._messages.put(self.channel.recv())
+        except (EOFError, OSError, ValueError):
+            self._messages.put(None)
+
+    def _handle(self, message) -> bool:
+        """Apply one message; returns True once the game has finished"""
+        if message is None:
+            # Pipe closed without a result: the game died
+            if self.result is None:
+                code = self.process.wait()
+                self.result = {"error": f"Game exited with code {code} without a result"}
+            return True
+
+        kind, data = message
+        if kind == "ready":
+            self.ready = True
+        elif kind == "progress":
+            self.progress = data
+        elif kind == "result":
+            self.result = data
+        elif kind == "error":
+            self.result = {"error": data}
+        return self.result is not None
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Handle any waiting messages; returns the result once the game has finished"""
+        while self.result is None:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                return None
+            self._handle(message)
+        return self.result
+
+    def wait(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        """Block until the game finishes; returns None on timeout"""
+        while self.result is None:
+            try:
+                message = self._messages.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            self._handle(message)
+        return self.result
+
+    def close(self):
+        """Release the pipes and reap the process"""
+        self.channel.close()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+
+def serve_game():
+    """Child side of GameProcess: run one game for the launcher on the other end of the pipes"""
+    channel = GameChannel.for_child()
+
+    # Warm up while the launcher has no game for us yet. Imported only now,
+    # so nothing printed on import reaches the pipe; importing maze_game
+    # generates the first maze (game_map)
+    import pygame
+    from maze_game import MazeGame
+    pygame.init()
+    pygame.font.SysFont('Arial', 16)  # First lookup scans the system fonts
+    channel.send("ready")
+
+    try:
+        try:
+            kind, config = channel.recv()
+        except EOFError:
+            # Launcher exited without starting a game
+            return
+        game = MazeGame(config)
+        game.progress_callback = lambda snapshot: channel.send("progress", snapshot)
+        channel.send("result", game.run())
+    except Exception as e:
+        channel.send("error", str(e))
+        raise
+    finally:
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    serve_game()
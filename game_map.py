@@ -19,6 +19,11 @@ MAP = generate_medium_maze()
 # Custom size maze
 # MAP = generate_custom_maze(41, 31)  # width, height
 
+# Hand-made maze from a text file ('#' walls, '.' or ' ' floor)
+# from maze_text import load_maze_text
+# from maze_generator import grid_to_maze
+# MAP = grid_to_maze(load_maze_text('custom_map.txt'))
+
 # Random size maze each time
 # sizes = [(21, 21), (25, 25), (31, 31), (35, 35)]
 # width, height = random.choice(sizes)
@@ -0,0 +1,310 @@
+"""
+Maze analysis for the Enhanced Maze Game
+Measures a maze grid (distance field, dead ends, junctions, solution path)
+and turns the measurements into a difficulty score
+"""
+
+import math
+import numpy as np
+from maze_generator import maze_to_grid
+
+# Difficulty labels by upper bound of the 0-100 score
+DIFFICULTY_LEVELS = [
+    (25, "easy"),
+    (50, "medium"),
+    (75, "hard"),
+    (101, "expert")
+]
+
+# Floor tile count at which the size component of the score saturates
+REFERENCE_FLOOR_TILES = 2500
+
+
+def find_spawn(grid):
+    """Find the spawn tile the game would use (first floor tile near the top-left corner)"""
+    height, width = grid.shape
+    for y in range(1, min(5, height - 1)):
+        for x in range(1, min(5, width - 1)):
+            if not grid[y, x]:
+                return x, y
+
+    # Fall back to the first floor tile anywhere
+    floor = np.argwhere(~grid)
+    if floor.size:
+        return int(floor[0][1]), int(floor[0][0])
+    return None
+
+
+def neighbour_counts(grid):
+    """Count open orthogonal neighbours for every tile (0 on walls)"""
+    open_tiles = np.pad(~grid, 1, constant_values=False)
+    counts = (open_tiles[:-2, 1:-1].astype(np.int8) + open_tiles[2:, 1:-1]
+              + open_tiles[1:-1, :-2] + open_tiles[1:-1, 2:])
+    counts[grid] = 0
+    return counts
+
+
+def distance_field(grid, start):
+    """
+    Breadth-first distance from start to every tile
+
+    The whole frontier is expanded with array operations each step, so the
+    Python-level loop only runs once per distance ring.
+
+    Args:
+        grid: Boolean wall grid (True = wall)
+        start: (x, y) tile to measure from
+
+    Returns:
+        int32 array shaped like grid, -1 for walls and unreachable tiles
+    """
+    height, width = grid.shape
+    padded_width = width + 2
+    open_tiles = np.pad(~grid, 1, constant_values=False).ravel()
+    dist = np.full(open_tiles.size, -1, dtype=np.int32)
+
+    start_index = (start[1] + 1) * padded_width + start[0] + 1
+    if not open_tiles[start_index]:
+        return dist.reshape(height + 2, padded_width)[1:-1, 1:-1]
+
+    offsets = np.array([1, -1, padded_width, -padded_width])
+    frontier = np.array([start_index])
+    dist[start_index] = 0
+    depth = 0
+
+    while frontier.size:
+        depth += 1
+        candidates = (frontier[:, None] + offsets).ravel()
+        candidates = candidates[open_tiles[candidates] & (dist[candidates] < 0)]
+        frontier = np.unique(candidates)
+        dist[frontier] = depth
+
+    return dist.reshape(height + 2, padded_width)[1:-1, 1:-1]
+
+
+def trace_path(dist, goal):
+    """Walk a distance field downhill from goal back to its origin"""
+    height, width = dist.shape
+    x, y = goal
+    if dist[y, x] < 0:
+        return []
+
+    path = [(x, y)]
+    while dist[y, x] > 0:
+        target = dist[y, x] - 1
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and dist[ny, nx] == target:
+                x, y = nx, ny
+                break
+        path.append((x, y))
+
+    path.reverse()
+    return path
+
+
+def farthest_tile(dist):
+    """Return the (x, y) tile with the largest distance and that distance"""
+    index = int(np.argmax(dist))
+    y, x = divmod(index, dist.shape[1])
+    return (x, y), int(dist[y, x])
+
+
+def difficulty_label(score):
+    """Map a 0-100 difficulty score to a difficulty label"""
+    for upper_bound, label in DIFFICULTY_LEVELS:
+        if score < upper_bound:
+            return label
+    return DIFFICULTY_LEVELS[-1][1]
+
+
+def analyze_maze(maze, spawn=None):
+    """
+    Analyze a maze and measure its difficulty
+
+    Args:
+        maze: Maze as a list of strings, list of lists or boolean wall grid
+        spawn: Spawn tile (x, y); defaults to the game's spawn rule
+
+    Returns:
+        Dictionary with the distance field, tile counts, solution path and difficulty
+    """
+    grid = maze_to_grid(maze)
+    if spawn is None:
+        spawn = find_spawn(grid)
+
+    counts = neighbour_counts(grid)
+    floor_tiles = int(np.count_nonzero(~grid))
+
+    height, width = grid.shape
+    if spawn is not None and not (0 <= spawn[0] < width and 0 <= spawn[1] < height and not grid[spawn[1], spawn[0]]):
+        # A spawn inside a wall reaches nothing; treat it like a maze without one
+        spawn = None
+
+    if spawn is None:
+        dist = np.full(grid.shape, -1, dtype=np.int32)
+        goal, solution_length, longest_path, solution_path = None, 0, 0, []
+    else:
+        dist = distance_field(grid, spawn)
+        # The exit is the reachable tile farthest from spawn
+        goal, solution_length = farthest_tile(dist)
+        solution_path = trace_path(dist, goal)
+        # Second sweep from the far end gives the maze's longest corridor
+        # (exact for perfect mazes, a lower bound once loops are added)
+        _, longest_path = farthest_tile(distance_field(grid, goal))
+
+    reachable = dist >= 0
+    reachable_tiles = int(np.count_nonzero(reachable))
+    dead_ends = int(np.count_nonzero(reachable & (counts == 1)))
+    junctions = int(np.count_nonzero(reachable & (counts >= 3)))
+
+    # Size: more floor means more to explore before the 80% win condition
+    size_factor = min(1.0, math.sqrt(reachable_tiles / REFERENCE_FLOOR_TILES))
+    # Dead ends force backtracking; a perfect maze has about 5% dead-end tiles
+    dead_end_factor = min(1.0, (dead_ends / reachable_tiles) * 10) if reachable_tiles else 0.0
+    # Winding: how much longer the solution is than a straight line
+    if goal is not None and solution_length > 0:
+        straight_line = abs(goal[0] - spawn[0]) + abs(goal[1] - spawn[1])
+        winding_factor = min(1.0, (solution_length / max(1, straight_line) - 1) / 4)
+    else:
+        winding_factor = 0.0
+
+    difficulty_score = round(100 * (0.5 * size_factor + 0.3 * dead_end_factor + 0.2 * winding_factor), 1)
+
+    return {
+        "width": grid.shape[1],
+        "height": grid.shape[0],
+        "spawn": spawn,
+        "goal": goal,
+        "distance_field": dist,
+        "floor_tiles": floor_tiles,
+        "reachable_tiles": reachable_tiles,
+        "dead_ends": dead_ends,
+        "junctions": junctions,
+        "longest_path": longest_path,
+        "solution_path": solution_path,
+        "solution_length": solution_length,
+        "difficulty_score": difficulty_score,
+        "difficulty": difficulty_label(difficulty_score)
+    }
+
+
+def label_components(grid):
+    """
+    Label the 4-connected floor regions of a grid with union-find
+
+    Unions run over every floor edge at once: each round hooks the larger
+    root onto the smaller one, then path halving flattens the forest, so
+    the number of rounds stays small even for huge mazes.
+
+    Returns:
+        (int32 array with a component id per floor tile and -1 for walls, component count)
+    """
+    height, width = grid.shape
+    floor = ~grid
+    parent = np.arange(height * width, dtype=np.int64)
+
+    index = parent.reshape(height, width)
+    horizontal = floor[:, :-1] & floor[:, 1:]
+    vertical = floor[:-1, :] & floor[1:, :]
+    first = np.concatenate([index[:, :-1][horizontal], index[:-1, :][vertical]])
+    second = np.concatenate([index[:, 1:][horizontal], index[1:, :][vertical]])
+
+    while first.size:
+        # Flatten to roots
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        root_a, root_b = parent[first], parent[second]
+        pending = root_a != root_b
+        if not pending.any():
+            break
+        root_a, root_b = root_a[pending], root_b[pending]
+        first, second = first[pending], second[pending]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+
+    labels = np.full(height * width, -1, dtype=np.int32)
+    flat_floor = floor.ravel()
+    roots, labels[flat_floor] = np.unique(parent[flat_floor], return_inverse=True)
+    return labels.reshape(height, width), len(roots)
+
+
+def validate_maze(maze, spawn=None, min_reachable=1.0):
+    """
+    Check that a maze is playable before it is uploaded or played
+
+    Args:
+        maze: Maze as a list of strings, list of lists or boolean wall grid
+        spawn: Spawn tile (x, y); defaults to the game's spawn rule
+        min_reachable: Share of floor that must be reachable from spawn
+
+    Returns:
+        Dictionary with a 'valid' flag, a list of 'errors' and the measurements behind them
+    """
+    report = {
+        "valid": False,
+        "errors": [],
+        "width": 0,
+        "height": 0,
+        "floor_tiles": 0,
+        "components": 0,
+        "reachable_tiles": 0,
+        "reachable_fraction": 0.0,
+        "spawn": spawn,
+        "spawn_on_floor": False,
+        "border_closed": False
+    }
+
+    try:
+        grid = maze_to_grid(maze)
+    except (ValueError, TypeError, IndexError) as e:
+        report["errors"].append(str(e))
+        return report
+
+    if grid.ndim != 2 or grid.shape[0] < 3 or grid.shape[1] < 3:
+        report["errors"].append("Maze must be at least 3x3 tiles")
+        return report
+
+    height, width = grid.shape
+    report["width"], report["height"] = width, height
+    report["border_closed"] = bool(grid[0].all() and grid[-1].all() and grid[:, 0].all() and grid[:, -1].all())
+
+    floor_tiles = int(np.count_nonzero(~grid))
+    report["floor_tiles"] = floor_tiles
+    if not floor_tiles:
+        report["errors"].append("Maze has no floor")
+        return report
+
+    labels, components = label_components(grid)
+    report["components"] = components
+
+    if spawn is None:
+        spawn = find_spawn(grid)
+    report["spawn"] = spawn
+    x, y = spawn
+    if not (0 <= x < width and 0 <= y < height) or grid[y, x]:
+        report["errors"].append(f"Spawn {tuple(spawn)} is not on a floor tile")
+        return report
+    report["spawn_on_floor"] = True
+
+    reachable_tiles = int(np.count_nonzero(labels == labels[y, x]))
+    report["reachable_tiles"] = reachable_tiles
+    report["reachable_fraction"] = reachable_tiles / floor_tiles
+    if report["reachable_fraction"] < min_reachable:
+        report["errors"].append(
+            f"Only {reachable_tiles} of {floor_tiles} floor tiles are reachable from spawn "
+            f"({components} separate regions)"
+        )
+
+    report["valid"] = not report["errors"]
+    return report
+
+
+def analysis_summary(analysis):
+    """Return the JSON-friendly part of an analysis (no arrays or paths)"""
+    return {
+        key: value for key, value in analysis.items()
+        if key not in ("distance_field", "solution_path")
+    }
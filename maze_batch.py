@@ -0,0 +1,185 @@
+"""
+Batch maze generation for the Enhanced Maze Game
+Generates many mazes in parallel and keeps a warm queue of ready mazes per size tier
+"""
+
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from maze_generator import MAZE_SIZES, MazeGenerator
+
+
+def _generate_grid(job: Tuple[int, int, Optional[int]]) -> np.ndarray:
+    """Worker entry point: build one maze and return its compact wall grid"""
+    width, height, seed = job
+    return MazeGenerator(width, height, seed=seed).get_grid()
+
+
+def generate_batch(count: int, width: int, height: int, seed: int = None,
+                   max_workers: int = None, executor: ProcessPoolExecutor = None) -> List[np.ndarray]:
+    """
+    Generate several mazes in parallel
+
+    Args:
+        count: Number of mazes to generate
+        width: Maze width in tiles
+        height: Maze height in tiles
+        seed: Base seed; maze i uses seed + i so a batch is reproducible
+        max_workers: Worker processes (defaults to the CPU count)
+        executor: Existing pool to reuse instead of starting a new one
+
+    Returns:
+        List of boolean wall grids (True = wall), in seed order
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    jobs = [(width, height, seed + i) for i in range(count)]
+
+    # Hand each worker a few jobs at a time to keep pickling overhead down
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, count // (workers * 4))
+
+    if executor is not None:
+        return list(executor.map(_generate_grid, jobs, chunksize=chunksize))
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_generate_grid, jobs, chunksize=chunksize))
+
+
+class MazeQueue:
+    """
+    Bounded queues of pre-generated mazes, one per size tier
+
+    A background thread keeps every tier topped up from a process pool,
+    so get() normally returns instantly. If a tier runs dry the maze is
+    generated on the calling thread instead of waiting.
+    """
+
+    def __init__(self, tiers: Dict[str, Tuple[int, int]] = None, depth: int = 3, max_workers: int = None):
+        self.tiers = dict(tiers or MAZE_SIZES)
+        self.depth = depth
+        self.max_workers = max_workers
+        self.queues = {name: queue.Queue(maxsize=depth) for name in self.tiers}
+
+        self._pending = {name: 0 for name in self.tiers}
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._executor = None
+        self._thread = None
+
+    def start(self):
+        """Start the worker pool and the top-up thread"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._thread = threading.Thread(target=self._top_up_loop, name="MazeQueue", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop topping up and shut the pool down, cancelling generation jobs not yet started"""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
+        self._thread = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def get(self, tier: str = "medium") -> np.ndarray:
+        """
+        Take a ready maze for a tier
+
+        Args:
+            tier: Size tier name
+
+        Returns:
+            Boolean wall grid (True = wall)
+        """
+        if tier not in self.tiers:
+            raise ValueError(f"Unknown maze tier '{tier}', expected one of {', '.join(self.tiers)}")
+
+        try:
+            grid = self.queues[tier].get_nowait()
+        except queue.Empty:
+            width, height = self.tiers[tier]
+            grid = _generate_grid((width, height, None))
+
+        self._wake.set()
+        return grid
+
+    def ready_count(self, tier: str) -> int:
+        """Number of mazes currently waiting in a tier"""
+        return self.queues[tier].qsize()
+
+    def wait_until_full(self, timeout: float = None) -> bool:
+        """Block until every tier is full; returns False on timeout"""
+        deadline = None if timeout is None else time.time() + timeout
+        while any(not q.full() for q in self.queues.values()):
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _top_up_loop(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                for name, (width, height) in self.tiers.items():
+                    missing = self.depth - self.queues[name].qsize() - self._pending[name]
+                    for _ in range(missing):
+                        self._pending[name] += 1
+                        future = self._executor.submit(_generate_grid, (width, height, None))
+                        future.add_done_callback(lambda done, tier=name: self._on_ready(tier, done))
+
+            self._wake.wait()
+            self._wake.clear()
+
+    def _on_ready(self, tier, future):
+        with self._lock:
+            self._pending[tier] -= 1
+        try:
+            self.queues[tier].put_nowait(future.result())
+        except Exception:
+            # Full queue, cancelled or failed job: the top-up loop retries if needed
+            pass
+        self._wake.set()
+
+
+if __name__ == "__main__":
+    count = 64
+    width, height = MAZE_SIZES["huge"]
+
+    start = time.perf_counter()
+    serial = [_generate_grid((width, height, seed)) for seed in range(count)]
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = generate_batch(count, width, height, seed=0)
+    parallel_time = time.perf_counter() - start
+
+    assert all(np.array_equal(a, b) for a, b in zip(serial, parallel))
+    print(f"{count} mazes at {width}x{height}: serial {serial_time:.2f}s, "
+          f"parallel {parallel_time:.2f}s on {os.cpu_count()} CPUs")
+
+    with MazeQueue(depth=4) as maze_queue:
+        maze_queue.wait_until_full(timeout=30)
+        start = time.perf_counter()
+        grid = maze_queue.get("huge")
+        print(f"Warm queue handed out a {grid.shape[1]}x{grid.shape[0]} maze in "
+              f"{(time.perf_counter() - start) * 1000:.3f}ms")
@@ -0,0 +1,184 @@
+"""
+Headless simulation for the Enhanced Maze Game
+Runs MazeGame logic with no window and no frame limiter while a bot explores
+the maze, for soak tests and gameplay regression runs on machines without a
+display
+"""
+
+import os
+
+# Must be set before pygame opens a display
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import math
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from maze_game import MazeGame, TURN_SPEED, PLAYER_SPEED, WIN_EXPLORATION
+
+# Frame rate the real game is capped at, for converting ticks to game time
+GAME_FPS = 60
+
+
+class ExplorerBot:
+    """
+    Frontier-exploring player
+
+    The bot only uses what the player has seen: it walks the explored floor
+    to the nearest explored tile that borders unexplored ground, then picks
+    the next frontier once that one has been revealed.
+    """
+
+    def __init__(self, game: MazeGame):
+        self.game = game
+        self.path: List[Tuple[int, int]] = []
+        self.target: Optional[Tuple[int, int]] = None
+        self.stuck_ticks = 0
+
+    def _known_floor(self, col: int, row: int) -> bool:
+        return self.game.is_explored(col, row) and not self.game.is_wall(col, row)
+
+    def _is_frontier(self, col: int, row: int) -> bool:
+        game = self.game
+        for next_col, next_row in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+            if (0 <= next_col < game.MAP_WIDTH and 0 <= next_row < game.MAP_HEIGHT and
+                    not game.is_explored(next_col, next_row)):
+                return True
+        return False
+
+    def plan(self) -> bool:
+        """Breadth-first search over known floor to the nearest frontier tile"""
+        game = self.game
+        start = (int(game.player_x / game.TILE_SIZE), int(game.player_y / game.TILE_SIZE))
+        came_from = {start: None}
+        frontier = deque([start])
+
+        while frontier:
+            tile = frontier.popleft()
+            if tile != start and self._is_frontier(*tile):
+                path = []
+                while tile != start:
+                    path.append(tile)
+                    tile = came_from[tile]
+                self.path = path[::-1]
+                self.target = self.path[-1]
+                return True
+
+            col, row = tile
+            for step in ((col + 1, row), (col - 1, row), (col, row + 1), (col, row - 1)):
+                if step not in came_from and self._known_floor(*step):
+                    came_from[step] = tile
+                    frontier.append(step)
+
+        self.path, self.target = [], None
+        return False
+
+    def controls(self) -> Tuple[int, int, int]:
+        """Decide this tick's (turn, forward, strafe) input"""
+        game = self.game
+        if self.target is not None and not self._is_frontier(*self.target):
+            # Already revealed on the way; head for a newer frontier instead
+            self.path = []
+        if not self.path and not self.plan():
+            return 0, 0, 0
+
+        col, row = self.path[0]
+        dx = (col + 0.5) * game.TILE_SIZE - game.player_x
+        dy = (row + 0.5) * game.TILE_SIZE - game.player_y
+        if math.hypot(dx, dy) <= PLAYER_SPEED:
+            self.path.pop(0)
+            return self.controls() if self.path else (0, 0, 0)
+
+        # Forward in MazeGame is (-sin(angle), cos(angle))
+        heading = math.atan2(-dx, dy)
+        error = (heading - game.player_angle + math.pi) % (2 * math.pi) - math.pi
+        if abs(error) <= TURN_SPEED:
+            game.player_angle = heading
+            return 0, 1, 0
+        turn = 1 if error > 0 else -1
+        # Keep walking through gentle corrections, stop to turn corners
+        return turn, int(abs(error) < 0.5), 0
+
+
+def simulate(game: MazeGame = None, max_ticks: int = 200000, sample_every: int = 100,
+             bot: ExplorerBot = None) -> Dict[str, Any]:
+    """
+    Run the game loop headlessly until the bot reaches the win condition
+
+    Args:
+        game: Game to drive (a new guest game if None)
+        max_ticks: Give up after this many ticks
+        sample_every: Ticks between exploration curve samples
+        bot: Controller to use (an ExplorerBot if None)
+
+    Returns:
+        Dictionary with completion, tick counts, ticks per second and the exploration curve
+    """
+    game = game or MazeGame()
+    bot = bot or ExplorerBot(game)
+    curve = []
+    completed = False
+    stalled = False
+
+    start = time.perf_counter()
+    tick = 0
+    exploration = game.update_game_state()
+    while tick < max_ticks:
+        turn, forward, strafe = bot.controls()
+        if not (turn or forward or strafe):
+            # Nothing left the bot can reach
+            stalled = True
+            break
+
+        before = (game.player_x, game.player_y, game.player_angle)
+        game.apply_controls(turn, forward, strafe)
+        exploration = game.update_game_state()
+        tick += 1
+
+        if (game.player_x, game.player_y, game.player_angle) == before:
+            bot.stuck_ticks += 1
+            if bot.stuck_ticks > GAME_FPS:
+                stalled = True
+                break
+        else:
+            bot.stuck_ticks = 0
+
+        if tick % sample_every == 0:
+            curve.append((tick, round(exploration, 4)))
+        if exploration >= WIN_EXPLORATION:
+            completed = True
+            break
+    elapsed = time.perf_counter() - start
+
+    curve.append((tick, round(exploration, 4)))
+    return {
+        "completed": completed,
+        "stalled": stalled,
+        "ticks": tick,
+        "wall_time": elapsed,
+        "ticks_per_second": tick / elapsed if elapsed > 0 else 0.0,
+        "game_time": tick / GAME_FPS,
+        "exploration": exploration,
+        "score": game.calculate_score(),
+        "exploration_curve": curve
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    from maze_generator import MAZE_SIZES, MazeGenerator
+
+    game = MazeGame()
+    failed = False
+    for name, (width, height) in MAZE_SIZES.items():
+        for seed in range(3):
+            game.load_maze(MazeGenerator(width, height, seed=seed).get_maze())
+            result = simulate(game)
+            failed |= not result["completed"]
+            status = "✅" if result["completed"] else "❌"
+            print(f"{status} {name} seed {seed}: {result['ticks']} ticks "
+                  f"({result['game_time']:.0f}s game time) in {result['wall_time']:.2f}s, "
+                  f"{result['ticks_per_second']:.0f} ticks/s, {result['exploration'] * 100:.1f}% explored")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,206 @@
+"""
+Local catalog of public mazes for the Enhanced Maze Game
+Keeps maze metadata (no layouts) on disk and in memory, syncs only the rows
+changed since the last sync, and filters and sorts without the network
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from maze_analysis import DIFFICULTY_LEVELS
+from supabase_handler import MAZE_SUMMARY_COLUMNS
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".maze_game", "maze_catalog.json")
+
+# Metadata kept per maze; the full schema also tracks ratings and update times
+CATALOG_COLUMNS = MAZE_SUMMARY_COLUMNS + ", average_rating, rating_count, updated_at"
+
+# Rows fetched per request while syncing
+SYNC_PAGE_SIZE = 500
+
+# PostgreSQL error code PostgREST passes on for a column that doesn't exist
+UNDEFINED_COLUMN = "42703"
+
+_DIFFICULTY_RANK = {label: rank for rank, (_, label) in enumerate(DIFFICULTY_LEVELS)}
+
+# Sort keys; every key puts missing values last in ascending order
+SORT_KEYS = {
+    "play_count": lambda maze: maze.get("play_count") or 0,
+    "rating": lambda maze: maze.get("average_rating") or 0,
+    "size": lambda maze: (maze.get("width") or 0) * (maze.get("height") or 0),
+    "difficulty": lambda maze: _DIFFICULTY_RANK.get(maze.get("difficulty"), len(_DIFFICULTY_RANK)),
+    "created_at": lambda maze: maze.get("created_at") or "",
+    "name": lambda maze: (maze.get("maze_name") or "").lower()
+}
+
+
+def is_missing_column(error: Exception) -> bool:
+    """True if a query failed because a selected column doesn't exist (postgrest APIError)"""
+    return getattr(error, "code", None) == UNDEFINED_COLUMN
+
+
+class MazeCatalog:
+    """
+    Client-side index of public maze metadata
+
+    sync() asks the server only for rows whose watermark column (updated_at,
+    or created_at on the simple schema) is at or after the newest value
+    already seen. query() then filters and sorts in memory, using sort
+    orders cached until the next sync changes the catalog.
+    """
+
+    def __init__(self, db_handler, path: str = DEFAULT_CATALOG_PATH):
+        self.db_handler = db_handler
+        self.path = path
+        self.mazes: Dict[int, Dict[str, Any]] = {}
+        self.watermark: Optional[str] = None
+        self.columns = CATALOG_COLUMNS
+        self.watermark_column = "updated_at"
+
+        self._sorted: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Load the catalog saved by a previous run, if any"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f)
+            self.watermark_column = saved.get("watermark_column", self.watermark_column)
+            if self.watermark_column == "created_at":
+                self.columns = MAZE_SUMMARY_COLUMNS
+            self.watermark = saved.get("watermark")
+            self.mazes = {maze["id"]: maze for maze in saved.get("mazes", [])}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ignoring unreadable maze catalog: {e}")
+            self.mazes, self.watermark = {}, None
+
+    def save(self):
+        """Write the catalog to disk"""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock:
+            saved = {
+                "watermark_column": self.watermark_column,
+                "watermark": self.watermark,
+                "mazes": list(self.mazes.values())
+            }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(saved, f)
+        os.replace(temp_path, self.path)
+
+    def _fetch_page(self, offset: int) -> List[Dict[str, Any]]:
+        query = self.db_handler.supabase.table("mazes").select(self.columns)
+        if self.watermark is not None:
+            # Inclusive, so rows sharing the newest timestamp are not skipped
+            query = query.gte(self.watermark_column, self.watermark)
+        return query.order(self.watermark_column).range(offset, offset + SYNC_PAGE_SIZE - 1).execute().data
+
+    def sync(self) -> int:
+        """
+        Fetch mazes added or changed since the last sync
+
+        Returns:
+            Number of rows received, or -1 if the sync failed
+        """
+        rows = []
+        try:
+            try:
+                offset = 0
+                while True:
+                    page = self._fetch_page(offset)
+                    rows.extend(page)
+                    if len(page) < SYNC_PAGE_SIZE:
+                        break
+                    offset += SYNC_PAGE_SIZE
+            except Exception as e:
+                # Only a missing column means the simple schema; timeouts, being
+                # offline or server errors fail this sync and leave the schema alone
+                if self.watermark_column == "created_at" or not is_missing_column(e):
+                    raise
+                # Simple schema: no ratings or updated_at, so only new mazes can be picked up
+                self.columns, self.watermark_column = MAZE_SUMMARY_COLUMNS, "created_at"
+                self.watermark = None
+                return self.sync()
+        except Exception as e:
+            print(f"Error syncing maze catalog: {e}")
+            return -1
+
+        with self._lock:
+            for maze in rows:
+                # Rows visible to us but not public are our own private mazes (or unpublished ones)
+                if maze.get("is_public", True):
+                    self.mazes[maze["id"]] = maze
+                else:
+                    self.mazes.pop(maze["id"], None)
+                stamp = maze.get(self.watermark_column)
+                if stamp and (self.watermark is None or stamp > self.watermark):
+                    self.watermark = stamp
+            if rows:
+                self._sorted.clear()
+
+        if rows:
+            self.save()
+        return len(rows)
+
+    def rebuild(self) -> int:
+        """Drop the local catalog and fetch it again (picks up deleted mazes)"""
+        with self._lock:
+            self.mazes.clear()
+            self._sorted.clear()
+            self.watermark = None
+        return self.sync()
+
+    def query(self, difficulty: str = None, size: str = None, name: str = None, min_rating: float = None,
+              sort_by: str = "play_count", descending: bool = True, limit: int = None) -> List[Dict[str, Any]]:
+        """
+        Filter and sort the local catalog
+
+        Args:
+            difficulty: Only mazes with this difficulty
+            size: Only mazes of this size, as "WIDTHxHEIGHT"
+            name: Only mazes whose name contains this text (case-insensitive)
+            min_rating: Only mazes rated at least this
+            sort_by: One of SORT_KEYS
+            descending: Sort largest first
+            limit: Maximum number of mazes to return
+
+        Returns:
+            List of maze metadata records
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort_by}', expected one of {', '.join(SORT_KEYS)}")
+
+        with self._lock:
+            ordered = self._sorted.get(sort_by)
+            if ordered is None:
+                ordered = sorted(self.mazes.values(), key=SORT_KEYS[sort_by])
+                self._sorted[sort_by] = ordered
+
+        if descending:
+            ordered = reversed(ordered)
+        name = name.lower() if name else None
+
+        results = []
+        for maze in ordered:
+            if difficulty and maze.get("difficulty") != difficulty:
+                continue
+            if size and f"{maze.get('width')}x{maze.get('height')}" != size:
+                continue
+            if name and name not in (maze.get("maze_name") or "").lower():
+                continue
+            if min_rating is not None and (maze.get("average_rating") or 0) < min_rating:
+                continue
+            results.append(maze)
+            if limit and len(results) >= limit:
+                break
+        return results
+
+    def __len__(self):
+        return len(self.mazes)
@@ -0,0 +1,157 @@
+"""
+Binary maze format for the Enhanced Maze Game
+Packs a maze into 1 bit per tile behind a small versioned header, with an
+optional zlib layer and base64 for text/JSON columns
+"""
+
+import base64
+import hashlib
+import struct
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from maze_generator import grid_to_maze, maze_to_grid
+
+MAGIC = b"MZ"
+VERSION = 1
+
+# Header flags
+FLAG_ZLIB = 0x01
+FLAG_SEED = 0x02
+
+DEFAULT_ALGORITHM = "recursive_backtracker"
+
+# magic, version, flags, width, height, seed, algorithm name length
+_HEADER = struct.Struct(">2sBBIIQB")
+
+
+def encode_maze(maze, seed: int = None, algorithm: str = DEFAULT_ALGORITHM, compress: bool = True) -> bytes:
+    """
+    Encode a maze to the binary format
+
+    Args:
+        maze: Maze as a list of strings, list of lists or boolean wall grid
+        seed: Generator seed, if known (0 to 2**64 - 1)
+        algorithm: Name of the generation algorithm
+        compress: Add a zlib layer over the packed bits
+
+    Returns:
+        Encoded maze bytes
+    """
+    grid = maze_to_grid(maze)
+    height, width = grid.shape
+
+    flags = 0
+    if seed is not None:
+        if not 0 <= seed < 2 ** 64:
+            raise ValueError("Maze seed must fit in an unsigned 64-bit integer")
+        flags |= FLAG_SEED
+
+    payload = np.packbits(grid, axis=None).tobytes()
+    if compress:
+        compressed = zlib.compress(payload, 9)
+        # Tiny or noisy mazes can grow under zlib; keep whichever is smaller
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= FLAG_ZLIB
+
+    name = algorithm.encode("ascii")
+    if len(name) > 255:
+        raise ValueError("Algorithm name must be at most 255 characters")
+
+    header = _HEADER.pack(MAGIC, VERSION, flags, width, height, seed or 0, len(name))
+    return header + name + payload
+
+
+def decode_maze(data: bytes) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """
+    Decode bytes produced by encode_maze
+
+    Returns:
+        (boolean wall grid, header dictionary with width, height, seed, algorithm, version)
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Maze data is too short")
+
+    magic, version, flags, width, height, seed, name_length = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded maze")
+    if version > VERSION:
+        raise ValueError(f"Unsupported maze format version {version}")
+
+    offset = _HEADER.size
+    algorithm = data[offset:offset + name_length].decode("ascii")
+    payload = data[offset + name_length:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=width * height)
+    grid = bits.reshape(height, width).astype(bool)
+
+    header = {
+        "version": version,
+        "width": width,
+        "height": height,
+        "seed": seed if flags & FLAG_SEED else None,
+        "algorithm": algorithm
+    }
+    return grid, header
+
+
+def encode_maze_text(maze, seed: int = None, algorithm: str = DEFAULT_ALGORITHM, compress: bool = True) -> str:
+    """Encode a maze as base64 text for text and JSON columns"""
+    return base64.b64encode(encode_maze(maze, seed, algorithm, compress)).decode("ascii")
+
+
+def decode_maze_text(text: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Decode text produced by encode_maze_text"""
+    return decode_maze(base64.b64decode(text))
+
+
+def maze_hash(maze) -> str:
+    """
+    Content hash of a maze layout
+
+    Covers only the dimensions and the wall bits, so the same layout hashes
+    the same whatever its floor character, seed, algorithm or compression.
+
+    Returns:
+        SHA-256 hex digest
+    """
+    grid = maze_to_grid(maze)
+    height, width = grid.shape
+    digest = hashlib.sha256(struct.pack(">II", width, height))
+    digest.update(np.packbits(grid, axis=None).tobytes())
+    return digest.hexdigest()
+
+
+def load_maze_data(value) -> List[str]:
+    """
+    Turn a stored maze_data value back into a list of strings
+
+    Accepts the base64 binary format as well as the older JSON form
+    (a list of strings or a list of single-character lists). Floors
+    always come back as '.'.
+    """
+    if isinstance(value, str):
+        grid, _ = decode_maze_text(value)
+    elif isinstance(value, (bytes, bytearray)):
+        grid, _ = decode_maze(bytes(value))
+    else:
+        grid = maze_to_grid(value)
+    return grid_to_maze(grid)
+
+
+if __name__ == "__main__":
+    import json
+    from maze_generator import MazeGenerator
+
+    for width, height in [(25, 25), (51, 51), (201, 201), (1001, 1001)]:
+        generator = MazeGenerator(width, height, seed=1)
+        legacy = json.dumps(generator.maze)
+        packed = encode_maze_text(generator.get_grid(), seed=1)
+        assert load_maze_data(packed) == generator.get_maze()
+        print(f"{width}x{height}: JSON {len(legacy):>9} bytes, "
+              f"binary {len(packed):>7} bytes ({len(legacy) / len(packed):.0f}x smaller)")
@@ -2,11 +2,16 @@ import pygame
 import sys
 import math
 import time
-import json
-import os
+import queue
+import threading
 from datetime import datetime
-from supabase_handler import GameSupabaseHandler
+from db_broker import open_db_handler
 from game_map import MAP
+from maze_analysis import analyze_maze
+from maze_generator import MazeGenerator
+from chunked_map import ChunkedMap
+from maze_world import MazeWorld
+import startup_trace
 
 # Game constants
 SCREEN_HEIGHT = 480
@@ -18,8 +23,60 @@ STEP_ANGLE = FOV / CASTED_RAYS
 SCALE = (SCREEN_WIDTH / 2) / CASTED_RAYS
 VISION_RANGE = 6
 
+# Player movement per tick
+PLAYER_SPEED = 1.5  # Slightly increased speed for better movement feel
+TURN_SPEED = 0.05
+PLAYER_RADIUS = 8  # Smaller radius for better movement
+
+# Share of the maze to explore to finish a level
+WIN_EXPLORATION = 0.8
+
+# Seconds between progress reports to a launcher
+PROGRESS_INTERVAL = 1.0
+
+# Seconds end_game waits for buffered database work to finish
+DB_FLUSH_TIMEOUT = 10.0
+
+# Streamed (chunked file) maps use a fixed tile size and only look this far
+STREAMED_TILE_SIZE = 20
+STREAMED_VIEW_TILES = 24
+
+_startup_maze_taken = False
+_startup_maze_lock = threading.Lock()
+
+def new_game_maze():
+    """
+    Maze (and its analysis, if known) for a new MazeGame
+    
+    The first game in a process gets the maze game_map generated on import;
+    later ones (e.g. each Play in one menu session) get a fresh maze of the
+    same size.
+    
+    Returns:
+        (maze as a list of strings, analysis or None)
+    """
+    global _startup_maze_taken
+    with _startup_maze_lock:
+        first = not _startup_maze_taken
+        _startup_maze_taken = True
+    if first:
+        return list(MAP), None
+    generator = MazeGenerator(len(MAP[0]), len(MAP))
+    return list(generator.get_maze()), generator.get_analysis()
+
 class MazeGame:
-    def __init__(self, game_config=None):
+    def __init__(self, game_config=None, db_handler=None):
+        """
+        Set up a game
+        
+        Args:
+            game_config: Settings from the menu (player, session, map options)
+            db_handler: Database handler shared with the menu when running in
+                the same process; a separate process restores its own from
+                the config's session data
+        """
+        self.created_at = time.perf_counter()
+        self.time_to_first_frame = None
         pygame.init()
         
         # Load configuration passed from menu
@@ -28,35 +85,44 @@ class MazeGame:
         self.user_id = self.config.get('user_id')
         self.session_data = self.config.get('session_data')
         
-        # Initialize database if user is authenticated
-        self.db_handler = None
-        if self.user_id and self.session_data:
-            try:
-                self.db_handler = GameSupabaseHandler()
-                # Restore session using session data
-                if self.session_data.get('access_token'):
-                    success = self.db_handler.restore_session(
-                        self.session_data['access_token'],
-                        self.session_data.get('refresh_token')
-                    )
-                    if not success:
-                        print("❌ Failed to restore session, continuing as guest")
-                        self.db_handler = None
-                        self.player_name = 'Guest'
-                        self.user_id = None
-            except Exception as e:
-                print(f"Database connection failed: {e}")
-                self.db_handler = None
-                self.player_name = 'Guest'
-                self.user_id = None
+        # Database handler; a separate process restores its own session in
+        # setup_database, on the database thread, once the game is running
+        self.db_handler = db_handler
+        if db_handler is not None and not db_handler.is_authenticated():
+            self.player_name = 'Guest'
+            self.user_id = None
+        self.session_id = None
+        self.saved_to_db = False
         
-        # Calculate map dimensions
-        self.MAP = MAP
-        self.MAP_WIDTH = len(MAP[0])
-        self.MAP_HEIGHT = len(MAP)
-        self.TILE_SIZE = ((SCREEN_WIDTH / 2) / max(self.MAP_WIDTH, self.MAP_HEIGHT))
-        self.MAX_DEPTH = int(max(self.MAP_WIDTH, self.MAP_HEIGHT) * self.TILE_SIZE)
-        self.RAY_RANGE = VISION_RANGE * self.TILE_SIZE
+        # Huge mazes stream from a chunked map file and the endless world is
+        # generated chunk by chunk; neither lives in memory as a whole
+        self.streamed_map = None
+        self.world = None
+        if self.config.get('world_seed') is not None:
+            self.world = MazeWorld(self.config['world_seed'])
+            self.streamed_map = self.world
+        elif self.config.get('map_file'):
+            self.streamed_map = ChunkedMap(self.config['map_file'])
+        
+        if self.streamed_map is not None:
+            # Keep every chunk a ray or the minimap can touch, plus a ring for turning
+            chunk_radius = STREAMED_VIEW_TILES // self.streamed_map.chunk_size + 2
+            self.streamed_map.cache_chunks = (2 * chunk_radius + 1) ** 2
+            if self.world is not None:
+                self.world.prefetch_radius = chunk_radius
+            self.MAP = None
+            self.update_map_dimensions()
+            # Whole-maze analysis isn't possible here; use what the file recorded
+            self.analysis = dict(self.streamed_map.metadata)
+            self.analysis.setdefault('difficulty', None)
+        else:
+            # Calculate map dimensions (own copy so maze swaps can reuse the list)
+            self.MAP, analysis = new_game_maze()
+            self.update_map_dimensions()
+            
+            # Measure the maze once so sessions carry a real difficulty
+            self.analysis = analysis or analyze_maze(self.MAP)
+        self.total_explorable = self.analysis['floor_tiles']
         
         # Game state
         self.player_x, self.player_y = self.find_spawn_position()
@@ -66,8 +132,25 @@ class MazeGame:
         self.game_start_time = time.time()
         self.show_minimap = False
         
-        # Player collision radius
-        self.player_radius = 8  # Smaller radius for better movement
+        # Levels: finishing a maze banks its score and swaps in the next one
+        self.level = 1
+        self.levels_completed = 0
+        self.banked_score = 0
+        
+        # Set once the game has ended; run() returns it
+        self.result = None
+        self.stopping = threading.Event()
+        
+        # Called with progress() about once a second while running, if set
+        self.progress_callback = None
+        self.last_progress_time = 0
+        
+        # The next maze is built on a background thread while this one is played
+        self.next_maze = queue.Queue(maxsize=1)
+        self.pregeneration_thread = None
+        if self.streamed_map is None:
+            self.pregeneration_thread = threading.Thread(target=self.pregenerate_mazes, daemon=True)
+            self.pregeneration_thread.start()
         
         # Display setup
         self.win = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -81,9 +164,192 @@ class MazeGame:
         self.GREEN = (0, 200, 0)
         self.RED = (200, 0, 0)
         
-        # Start game session
+        # Connect and start the game session without holding up the first frame
+        self.start_db_worker()
+    
+    def start_db_worker(self):
+        """Start the thread that runs all database work for this game, in order"""
+        self.db_tasks = queue.Queue()
+        self.db_thread = threading.Thread(target=self.run_db_tasks, name="MazeGameDB", daemon=True)
+        self.db_thread.start()
+        self.queue_db_task(self.setup_database)
+    
+    def queue_db_task(self, task, *args, **kwargs):
+        """
+        Buffer database work for the database thread
+        
+        Tasks run in the order queued and always after setup_database, so
+        anything saved during the game is attached to the session once its
+        ID has arrived.
+        """
+        self.db_tasks.put((task, args, kwargs))
+    
+    def run_db_tasks(self):
+        """Database thread: run queued tasks until flush_db_tasks asks it to stop"""
+        while True:
+            item = self.db_tasks.get()
+            if item is None:
+                return
+            task, args, kwargs = item
+            try:
+                task(*args, **kwargs)
+            except Exception as e:
+                print(f"Database task failed: {e}")
+    
+    def flush_db_tasks(self, timeout=DB_FLUSH_TIMEOUT):
+        """
+        Wait for all buffered database work, then stop the database thread
+        
+        Returns:
+            True if everything finished within the timeout
+        """
+        self.db_tasks.put(None)
+        self.db_thread.join(timeout)
+        if self.db_thread.is_alive():
+            print("⚠️ Database work still running, not waiting for it")
+            return False
+        return True
+    
+    def setup_database(self):
+        """Database thread: restore the session if needed and start the game session"""
+        if self.db_handler is None and self.user_id and self.session_data:
+            try:
+                db_handler = open_db_handler()
+                # Restore session using session data
+                if self.session_data.get('access_token') and db_handler.restore_session(
+                        self.session_data['access_token'],
+                        self.session_data.get('refresh_token')):
+                    self.db_handler = db_handler
+                else:
+                    print("❌ Failed to restore session, continuing as guest")
+            except Exception as e:
+                print(f"Database connection failed: {e}")
+            if self.db_handler is None:
+                self.player_name = 'Guest'
+                self.user_id = None
+        
+        if self.db_handler and self.db_handler.is_authenticated():
+            if self.world is not None:
+                self.session_id = self.db_handler.start_game_session(difficulty="endless")
+            else:
+                self.session_id = self.db_handler.start_game_session(
+                    self.MAP_WIDTH, self.MAP_HEIGHT,
+                    difficulty=self.analysis['difficulty']
+                )
+    
+    def save_level(self, score, completion_time, maze_size):
+        """Database thread: record a finished level"""
         if self.db_handler and self.db_handler.is_authenticated():
-            self.db_handler.start_game_session()
+            try:
+                self.db_handler.save_game_progress(
+                    score=score,
+                    completion_time=completion_time,
+                    maze_size=maze_size,
+                    completed=True
+                )
+            except Exception as e:
+                print(f"Failed to save level to database: {e}")
+    
+    def save_final_result(self, score, total_score, completion_time, maze_size, completed):
+        """Database thread: record the last level and close the game session"""
+        if self.db_handler and self.db_handler.is_authenticated():
+            try:
+                self.db_handler.save_game_progress(
+                    score=score,
+                    completion_time=completion_time,
+                    maze_size=maze_size
+                )
+                self.db_handler.end_game_session(total_score, completed=completed)
+                self.saved_to_db = True
+            except Exception as e:
+                print(f"Failed to save to database: {e}")
+    
+    def update_map_dimensions(self):
+        """Recalculate size-dependent values after the map changes"""
+        if self.streamed_map is not None:
+            self.MAP_WIDTH = self.streamed_map.width
+            self.MAP_HEIGHT = self.streamed_map.height
+            # Sizing off the whole maze would shrink tiles to nothing; rays
+            # only need to reach the view distance
+            self.TILE_SIZE = STREAMED_TILE_SIZE
+            self.MAX_DEPTH = int(STREAMED_VIEW_TILES * self.TILE_SIZE)
+        else:
+            self.MAP_WIDTH = len(self.MAP[0])
+            self.MAP_HEIGHT = len(self.MAP)
+            self.TILE_SIZE = ((SCREEN_WIDTH / 2) / max(self.MAP_WIDTH, self.MAP_HEIGHT))
+            self.MAX_DEPTH = int(max(self.MAP_WIDTH, self.MAP_HEIGHT) * self.TILE_SIZE)
+        self.RAY_RANGE = VISION_RANGE * self.TILE_SIZE
+        # Player collision radius; shrinks on big mazes so corridors stay passable
+        self.player_radius = min(PLAYER_RADIUS, self.TILE_SIZE * 0.4)
+    
+    def pregenerate_mazes(self):
+        """Background thread: keep one ready maze (and its analysis) waiting"""
+        while not self.stopping.is_set():
+            generator = MazeGenerator(self.MAP_WIDTH, self.MAP_HEIGHT)
+            ready = (generator.get_maze(), generator.get_analysis())
+            # Wait until the current ready maze has been taken, or the game ends
+            while not self.stopping.is_set():
+                try:
+                    self.next_maze.put(ready, timeout=0.5)
+                    break
+                except queue.Full:
+                    pass
+    
+    def load_maze(self, maze, analysis=None):
+        """
+        Swap in a new maze without rebuilding the game
+        
+        The map list and explored set are reused; size-dependent values
+        are only recalculated when the dimensions change.
+        """
+        resized = len(maze) != self.MAP_HEIGHT or len(maze[0]) != self.MAP_WIDTH
+        self.MAP[:] = maze
+        if resized:
+            self.update_map_dimensions()
+        
+        self.analysis = analysis or analyze_maze(self.MAP)
+        self.total_explorable = self.analysis['floor_tiles']
+        
+        self.explored_tiles.clear()
+        self.player_x, self.player_y = self.find_spawn_position()
+        self.player_angle = math.pi
+        self.current_score = 0
+        self.game_start_time = time.time()
+    
+    def regenerate_maze(self):
+        """Replace the current maze with the pre-generated one"""
+        if self.streamed_map is not None:
+            print("Streamed maps can't be regenerated")
+            return
+        
+        try:
+            maze, analysis = self.next_maze.get_nowait()
+        except queue.Empty:
+            # Background thread hasn't caught up; build one now
+            generator = MazeGenerator(self.MAP_WIDTH, self.MAP_HEIGHT)
+            maze, analysis = generator.get_maze(), generator.get_analysis()
+        
+        self.load_maze(maze, analysis)
+        print(f"New maze: {self.MAP_WIDTH} x {self.MAP_HEIGHT} ({self.analysis['difficulty']})")
+    
+    def complete_level(self):
+        """Bank the finished maze's score and move straight on to the next maze"""
+        if self.streamed_map is not None:
+            # A map file is a single level
+            self.end_game(completed=True)
+            return
+        
+        level_score = self.calculate_score()
+        level_time = time.time() - self.game_start_time
+        
+        self.queue_db_task(self.save_level, level_score, level_time, self.maze_size_label())
+        
+        self.banked_score += level_score
+        self.levels_completed += 1
+        self.level += 1
+        print(f"Level complete! Score: {level_score}, Time: {level_time:.1f}s")
+        
+        self.regenerate_maze()
     
     def is_tile_visible(self, tile_x, tile_y):
         """Check if a tile should be visible based on player's current position and vision range"""
@@ -98,16 +364,20 @@ class MazeGame:
 
     def find_spawn_position(self):
         """Find a good spawn position in the maze"""
+        if self.streamed_map is not None and self.streamed_map.spawn:
+            x, y = self.streamed_map.spawn
+            return (x + 0.5) * self.TILE_SIZE, (y + 0.5) * self.TILE_SIZE
+        
         for y in range(1, min(5, self.MAP_HEIGHT - 1)):
             for x in range(1, min(5, self.MAP_WIDTH - 1)):
                 if self.MAP[y][x] == '.':
                     return (x + 0.5) * self.TILE_SIZE, (y + 0.5) * self.TILE_SIZE
         return self.TILE_SIZE * 1.5, self.TILE_SIZE * 1.5
     
-    def is_wall_at_position(self, x, y):
-        """Check if there's a wall at the given position"""
-        col = int(x / self.TILE_SIZE)
-        row = int(y / self.TILE_SIZE)
+    def is_wall(self, col, row):
+        """Check if a tile is a wall; anything outside the map counts as wall"""
+        if self.streamed_map is not None:
+            return self.streamed_map.is_wall(col, row)
         
         # Check bounds
         if not (0 <= row < self.MAP_HEIGHT and 0 <= col < self.MAP_WIDTH):
@@ -115,6 +385,35 @@ class MazeGame:
         
         return self.MAP[row][col] == '#'
     
+    def mark_explored(self, col, row):
+        """Record a tile as explored"""
+        if self.world is not None:
+            self.world.mark_explored(col, row)
+        else:
+            self.explored_tiles.add((col, row))
+    
+    def is_explored(self, col, row):
+        """Check whether a tile has been explored"""
+        if self.world is not None:
+            return self.world.is_explored(col, row)
+        return (col, row) in self.explored_tiles
+    
+    def explored_count(self):
+        """Number of tiles explored so far"""
+        if self.world is not None:
+            return self.world.explored_count
+        return len(self.explored_tiles)
+    
+    def maze_size_label(self):
+        """Maze size as stored with progress records"""
+        if self.world is not None:
+            return "endless"
+        return f"{self.MAP_WIDTH}x{self.MAP_HEIGHT}"
+    
+    def is_wall_at_position(self, x, y):
+        """Check if there's a wall at the given position"""
+        return self.is_wall(int(x / self.TILE_SIZE), int(y / self.TILE_SIZE))
+    
     def check_collision(self, x, y):
         """Check if the player would collide with a wall at position (x, y)"""
         # Check collision using a circle around the player
@@ -159,6 +458,44 @@ class MazeGame:
         # No movement possible
         return False
     
+    def apply_controls(self, turn=0, forward=0, strafe=0):
+        """
+        Apply one tick of player input
+        
+        Args:
+            turn: -1 to turn left, 1 to turn right
+            forward: 1 to walk forward, -1 to walk back
+            strafe: 1 to strafe left, -1 to strafe right
+        """
+        self.player_angle += turn * TURN_SPEED
+        
+        if forward:
+            new_x = self.player_x + (-math.sin(self.player_angle) * PLAYER_SPEED * forward)
+            new_y = self.player_y + (math.cos(self.player_angle) * PLAYER_SPEED * forward)
+            self.move_player(new_x, new_y)
+        
+        if strafe:
+            new_x = self.player_x + math.cos(self.player_angle) * PLAYER_SPEED * strafe
+            new_y = self.player_y + math.sin(self.player_angle) * PLAYER_SPEED * strafe
+            self.move_player(new_x, new_y)
+    
+    def update_game_state(self):
+        """
+        Advance everything that doesn't depend on rendering by one tick
+        
+        Returns:
+            Share of the maze explored
+        """
+        if self.world is not None:
+            # Keep chunks ahead of the player generating in the background
+            self.world.request_around(int(self.player_x / self.TILE_SIZE), int(self.player_y / self.TILE_SIZE))
+        self.update_explored_tiles()
+        self.calculate_score()
+        
+        # Never reaches the win condition in the endless world
+        total_explorable = self.total_explorable
+        return self.explored_count() / total_explorable if total_explorable > 0 else 0
+    
     def update_explored_tiles(self):
         """Update explored tiles based on player position"""
         player_tile_x = int(self.player_x / self.TILE_SIZE)
@@ -172,11 +509,12 @@ class MazeGame:
                 if 0 <= tile_y < self.MAP_HEIGHT and 0 <= tile_x < self.MAP_WIDTH:
                     distance = math.sqrt(dx*dx + dy*dy)
                     if distance <= VISION_RANGE:
-                        self.explored_tiles.add((tile_x, tile_y))
+                        self.mark_explored(tile_x, tile_y)
     
     def cast_rays(self):
         """Cast rays for 3D rendering"""
         start_angle = self.player_angle - HALF_FOV
+        streamed_map = self.streamed_map
         
         for ray in range(CASTED_RAYS):
             hit_wall = False
@@ -189,13 +527,13 @@ class MazeGame:
                 col = int(target_x / self.TILE_SIZE)
                 row = int(target_y / self.TILE_SIZE)
                 
-                if 0 <= row < self.MAP_HEIGHT and 0 <= col < self.MAP_WIDTH:
-                    if self.MAP[row][col] == '#':
-                        hit_wall = True
-                        wall_distance = depth
-                        break
+                # In-memory lookups are inlined; this is the hottest loop in the game
+                if streamed_map is not None:
+                    hit_wall = streamed_map.is_wall(col, row)
                 else:
-                    hit_wall = True
+                    hit_wall = (not (0 <= row < self.MAP_HEIGHT and 0 <= col < self.MAP_WIDTH)
+                                or self.MAP[row][col] == '#')
+                if hit_wall:
                     wall_distance = depth
                     break
             
@@ -223,39 +561,49 @@ class MazeGame:
         if not self.show_minimap:
             return
         
+        # Streamed maps show a window around the player, in-memory maps show everything
+        if self.streamed_map is not None:
+            first_col = int(self.player_x / self.TILE_SIZE) - STREAMED_VIEW_TILES
+            first_row = int(self.player_y / self.TILE_SIZE) - STREAMED_VIEW_TILES
+            cols = rows = 2 * STREAMED_VIEW_TILES + 1
+        else:
+            first_col, first_row = 0, 0
+            cols, rows = self.MAP_WIDTH, self.MAP_HEIGHT
+        
         # Calculate minimap size to fit screen
         minimap_size = min(SCREEN_HEIGHT, SCREEN_WIDTH // 2)
-        minimap_tile_size = minimap_size / max(self.MAP_WIDTH, self.MAP_HEIGHT)
+        minimap_tile_size = minimap_size / max(cols, rows)
         
         # Draw background for the map area
         pygame.draw.rect(self.win, (50, 50, 50), (0, 0, minimap_size, minimap_size))
         
         # Draw the map with fog of war
-        for row in range(self.MAP_HEIGHT):
-            for col in range(self.MAP_WIDTH):
-                tile_pos = (col, row)
+        for row in range(first_row, first_row + rows):
+            for col in range(first_col, first_col + cols):
+                screen_x = (col - first_col) * minimap_tile_size
+                screen_y = (row - first_row) * minimap_tile_size
                 
-                if tile_pos in self.explored_tiles:
+                if self.is_explored(col, row):
                     if self.is_tile_visible(col, row):
-                        color = (200,200,200) if self.MAP[row][col] == '#' else (100,100,100)
+                        color = (200,200,200) if self.is_wall(col, row) else (100,100,100)
                         alpha = 255
                     else:
-                        color = (100,100,100) if self.MAP[row][col] == '#' else (50,50,50)
+                        color = (100,100,100) if self.is_wall(col, row) else (50,50,50)
                         alpha = 128
                     
                     tile_surface = pygame.Surface((minimap_tile_size - 1, minimap_tile_size - 1))
                     tile_surface.fill(color)
                     tile_surface.set_alpha(alpha)
                     
-                    self.win.blit(tile_surface, (col * minimap_tile_size, row * minimap_tile_size))
+                    self.win.blit(tile_surface, (screen_x, screen_y))
                 else:
                     pygame.draw.rect(self.win, (20, 20, 20), 
-                                (col * minimap_tile_size, row * minimap_tile_size, 
+                                (screen_x, screen_y, 
                                     minimap_tile_size - 1, minimap_tile_size - 1))
         
         # Draw player on minimap
-        minimap_player_x = (self.player_x / self.TILE_SIZE) * minimap_tile_size
-        minimap_player_y = (self.player_y / self.TILE_SIZE) * minimap_tile_size
+        minimap_player_x = (self.player_x / self.TILE_SIZE - first_col) * minimap_tile_size
+        minimap_player_y = (self.player_y / self.TILE_SIZE - first_row) * minimap_tile_size
         pygame.draw.circle(self.win, (255, 0, 0), (int(minimap_player_x), int(minimap_player_y)), 4)
         
         # Draw direction line
@@ -267,112 +615,104 @@ class MazeGame:
         """Calculate current score"""
         if self.game_start_time:
             time_bonus = max(0, 1000 - int(time.time() - self.game_start_time))
-            exploration_bonus = len(self.explored_tiles) * 10
+            exploration_bonus = self.explored_count() * 10
             self.current_score = time_bonus + exploration_bonus
         return self.current_score
     
-    def save_and_exit(self, completed=False):
-        """Save progress and exit to menu"""
+    def progress(self):
+        """Snapshot of the running game for a launcher's progress display"""
+        return {
+            'level': self.level,
+            'score': self.banked_score + self.current_score,
+            'explored': self.explored_count(),
+            'time': int(time.time() - self.game_start_time)
+        }
+    
+    def end_game(self, completed=False):
+        """
+        Save progress and stop the game; run() returns once this is called
+        
+        Returns:
+            Result dictionary for the menu
+        """
+        if self.result is not None:
+            return self.result
+        
         completion_time = time.time() - self.game_start_time
         final_score = self.calculate_score()
+        completed = completed or self.levels_completed > 0
+        
+        # Save to database if authenticated, after anything still buffered
+        self.queue_db_task(self.save_final_result, final_score, self.banked_score + final_score,
+                           completion_time, self.maze_size_label(), completed)
+        self.flush_db_tasks()
         
-        # Prepare result data
+        # Prepare result data (guest progress is saved by the menu)
         result_data = {
             'completed': completed,
-            'score': final_score,
+            'levels_completed': self.levels_completed,
+            'score': self.banked_score + final_score,
             'completion_time': completion_time,
-            'tiles_explored': len(self.explored_tiles),
+            'tiles_explored': self.explored_count(),
             'player_name': self.player_name,
             'user_id': self.user_id,
-            'maze_size': f"{self.MAP_WIDTH}x{self.MAP_HEIGHT}"
+            'maze_size': self.maze_size_label(),
+            'saved_to_db': self.saved_to_db,
+            'time_to_first_frame': self.time_to_first_frame
         }
         
-        # Save to database if authenticated
-        if self.db_handler and self.db_handler.is_authenticated():
-            try:
-                self.db_handler.save_game_progress(
-                    score=final_score,
-                    completion_time=completion_time,
-                    maze_size=f"{self.MAP_WIDTH}x{self.MAP_HEIGHT}"
-                )
-                self.db_handler.end_game_session(final_score, completed=completed)
-                result_data['saved_to_db'] = True
-            except Exception as e:
-                print(f"Failed to save to database: {e}")
-                result_data['saved_to_db'] = False
-        else:
-            # Save guest progress
-            result_data['saved_to_db'] = False
+        # Background work belongs to this game only
+        self.stopping.set()
+        if self.streamed_map is not None:
+            self.streamed_map.close()
         
-        # Write result to file for menu to read
-        with open('game_result.json', 'w') as f:
-            json.dump(result_data, f)
-        
-        pygame.quit()
-        sys.exit(0)
+        self.result = result_data
+        return result_data
     
     def run(self):
-        """Main game loop"""
-        speed = 1.5  # Slightly increased speed for better movement feel
+        """
+        Main game loop
         
-        while True:
+        Returns:
+            Result dictionary from end_game; 'quit' is set if the window was closed
+        """
+        while self.result is None:
             # Handle events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    self.save_and_exit(completed=False)
+                    self.end_game(completed=False)['quit'] = True
+                    break
                 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
-                        self.save_and_exit(completed=False)
+                        self.end_game(completed=False)
+                        break
                     elif event.key == pygame.K_m:
                         self.show_minimap = not self.show_minimap
                         print(f"Minimap {'ON' if self.show_minimap else 'OFF'}")
+                    elif event.key == pygame.K_r:
+                        self.regenerate_maze()
+            
+            if self.result is not None:
+                break
             
             # Handle movement
             keys = pygame.key.get_pressed()
             
-            # Rotation
-            if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                self.player_angle -= 0.05
-            if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                self.player_angle += 0.05
-            
-            # Movement
-            if keys[pygame.K_w] or keys[pygame.K_UP]:
-                new_x = self.player_x + (-math.sin(self.player_angle) * speed)
-                new_y = self.player_y + (math.cos(self.player_angle) * speed)
-                if self.is_valid_position(new_x, new_y):
-                    self.player_x, self.player_y = new_x, new_y
-            
-            if keys[pygame.K_s] or keys[pygame.K_DOWN]:
-                new_x = self.player_x - (-math.sin(self.player_angle) * speed)
-                new_y = self.player_y - (math.cos(self.player_angle) * speed)
-                if self.is_valid_position(new_x, new_y):
-                    self.player_x, self.player_y = new_x, new_y
-            
-            # Strafe movement
-            if keys[pygame.K_q]:  # Strafe left
-                new_x = self.player_x + math.cos(self.player_angle) * speed
-                new_y = self.player_y + math.sin(self.player_angle) * speed
-                if self.is_valid_position(new_x, new_y):
-                    self.player_x, self.player_y = new_x, new_y
+            turn = (keys[pygame.K_d] or keys[pygame.K_RIGHT]) - (keys[pygame.K_a] or keys[pygame.K_LEFT])
+            forward = (keys[pygame.K_w] or keys[pygame.K_UP]) - (keys[pygame.K_s] or keys[pygame.K_DOWN])
+            strafe = keys[pygame.K_q] - keys[pygame.K_e]
+            self.apply_controls(turn, forward, strafe)
             
-            if keys[pygame.K_e]:  # Strafe right
-                new_x = self.player_x - math.cos(self.player_angle) * speed
-                new_y = self.player_y - math.sin(self.player_angle) * speed
-                if self.is_valid_position(new_x, new_y):
-                    self.player_x, self.player_y = new_x, new_y
+            # Update game state and check the win condition
+            exploration_percentage = self.update_game_state()
+            total_explorable = self.total_explorable
             
-            # Update game state
-            self.update_explored_tiles()
-            self.calculate_score()
-            
-            # Check win condition
-            total_explorable = sum(1 for row in self.MAP for cell in row if cell == '.')
-            exploration_percentage = len(self.explored_tiles) / total_explorable if total_explorable > 0 else 0
-            
-            if exploration_percentage >= 0.8:
-                self.save_and_exit(completed=True)
+            if exploration_percentage >= WIN_EXPLORATION:
+                self.complete_level()
+                exploration_percentage = 0
+                if self.result is not None:
+                    break
             
             # Render
             self.win.fill(self.BLACK)
@@ -391,9 +731,11 @@ class MazeGame:
             font = pygame.font.SysFont('Arial', 16)
             
             ui_elements = [
-                f"Score: {self.current_score}",
+                f"Score: {self.banked_score + self.current_score}",
+                f"Level: {self.level}",
                 f"Time: {int(time.time() - self.game_start_time)}s",
-                f"Explored: {len(self.explored_tiles)}/{total_explorable} ({exploration_percentage*100:.1f}%)",
+                (f"Explored: {self.explored_count()}" if self.world is not None else
+                 f"Explored: {self.explored_count()}/{total_explorable} ({exploration_percentage*100:.1f}%)"),
                 f"Player: {self.player_name}",
                 f"Minimap: {'ON' if self.show_minimap else 'OFF'}"  # Add minimap status
             ]
@@ -403,14 +745,32 @@ class MazeGame:
                 self.win.blit(surface, (10, 10 + i * 20))
             
             # Controls
-            controls = ["WASD=move", "Q/E=strafe", "M=minimap", "ESC=quit"]
+            controls = ["WASD=move", "Q/E=strafe", "M=minimap", "R=new maze", "ESC=quit"]
             for i, control in enumerate(controls):
                 surface = font.render(control, True, self.GRAY)
-                self.win.blit(surface, (10, SCREEN_HEIGHT - 80 + i * 18))
+                self.win.blit(surface, (10, SCREEN_HEIGHT - 98 + i * 18))
             
             # FPS
             fps_surface = font.render(str(int(self.clock.get_fps())), True, self.WHITE)
             self.win.blit(fps_surface, (SCREEN_WIDTH - 60, 10))
             
             pygame.display.flip()
+            if self.time_to_first_frame is None:
+                self.time_to_first_frame = time.perf_counter() - self.created_at
+                startup_trace.record("game first frame", self.time_to_first_frame)
             self.clock.tick(60)  # Target 60 FPS
+            
+            if self.progress_callback and time.time() - self.last_progress_time >= PROGRESS_INTERVAL:
+                self.last_progress_time = time.time()
+                self.progress_callback(self.progress())
+        
+        return self.result
+
+
+if __name__ == "__main__":
+    # Standalone guest game; launchers run games through game_ipc.GameProcess
+    result = MazeGame().run()
+    print(f"🎮 Game result: {result}")
+    
+    pygame.quit()
+    sys.exit(0)
@@ -1,16 +1,40 @@
 import random
 import sys
+import numpy as np
+
+# Size tiers used by the generate_*_maze helpers (width, height)
+MAZE_SIZES = {
+    "small": (15, 15),
+    "medium": (25, 25),
+    "large": (35, 35),
+    "huge": (51, 51)
+}
+
+# Default braiding: share of corridor-separating walls opened into loops
+DEFAULT_LOOPS = 0.01
+
+# Neighbour offsets (dy, dx): up, down, left, right
+_DIRECTIONS = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
 
 class MazeGenerator:
-    def __init__(self, width=21, height=21):
+    def __init__(self, width=21, height=21, seed=None, loops=DEFAULT_LOOPS, dead_ends=0.0):
         # Ensure odd dimensions for proper maze generation
         self.width = width if width % 2 == 1 else width + 1
         self.height = height if height % 2 == 1 else height + 1
+        # Own random source so a seed reproduces the same maze in any process
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # Braiding targets, see braid()
+        self.loops = loops
+        self.dead_ends = dead_ends
         self.maze = []
+        self._analysis = None
         self.generate_maze()
     
     def generate_maze(self):
         """Generate a maze using recursive backtracking algorithm"""
+        self._analysis = None
+        
         # Initialize maze with all walls
         self.maze = [['#' for _ in range(self.width)] for _ in range(self.height)]
         
@@ -40,7 +64,7 @@ class MazeGenerator:
             
             if neighbors:
                 # Choose random neighbor
-                new_x, new_y, dx, dy = random.choice(neighbors)
+                new_x, new_y, dx, dy = self.rng.choice(neighbors)
                 
                 # Carve path to neighbor
                 self.maze[new_y][new_x] = '.'
@@ -56,8 +80,8 @@ class MazeGenerator:
         # Ensure there's always a clear starting area
         self.create_starting_area()
         
-        # Add some random openings for more interesting gameplay
-        self.add_random_openings()
+        # Open some walls into loops for more interesting gameplay
+        self.braid(self.loops, self.dead_ends)
     
     def create_starting_area(self):
         """Create a small clear area at the start"""
@@ -69,31 +93,94 @@ class MazeGenerator:
                     if not (x == 0 or y == 0 or x == self.width - 1 or y == self.height - 1):
                         self.maze[y][x] = '.'
     
-    def add_random_openings(self):
-        """Add some random openings to make the maze less linear"""
-        num_openings = max(1, (self.width * self.height) // 100)
+    def braid(self, loops=DEFAULT_LOOPS, dead_ends=0.0):
+        """
+        Open walls between corridors to add loops, using array operations
+        
+        Candidate walls sit between two cells (one odd and one even
+        coordinate) with corridor on both sides along one axis and wall on
+        the other, so opening one joins two corridors without carving open
+        rooms. Exactly round(ratio * available) walls are opened for
+        each target.
         
-        for _ in range(num_openings):
-            # Pick a random wall that's not on the border
-            x = random.randint(2, self.width - 3)
-            y = random.randint(2, self.height - 3)
+        Args:
+            loops: Share of candidate walls to open at random (0-1)
+            dead_ends: Share of remaining dead ends to open into a neighbouring corridor (0-1)
             
-            # Only remove walls that are between paths
-            if self.maze[y][x] == '#':
-                # Check if removing this wall connects two paths
-                adjacent_paths = 0
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    if self.maze[y + dy][x + dx] == '.':
-                        adjacent_paths += 1
-                
-                # Remove wall if it would connect paths but not create too open areas
-                if adjacent_paths >= 2 and random.random() < 0.3:
-                    self.maze[y][x] = '.'
+        Returns:
+            Number of walls opened
+        """
+        grid = maze_to_grid(self.maze).copy()
+        height, width = grid.shape
+        if height < 3 or width < 3:
+            return 0
+        rng = np.random.default_rng(self.rng.getrandbits(64))
+        opened = 0
+        rows, cols = np.indices(grid.shape)
+        between_cells = (rows + cols) % 2 == 1
+        
+        def candidate_walls():
+            floor = ~grid
+            across = np.zeros_like(grid)  # corridor left and right
+            along = np.zeros_like(grid)  # corridor above and below
+            across[1:-1, 1:-1] = floor[1:-1, :-2] & floor[1:-1, 2:] & grid[:-2, 1:-1] & grid[2:, 1:-1]
+            along[1:-1, 1:-1] = floor[:-2, 1:-1] & floor[2:, 1:-1] & grid[1:-1, :-2] & grid[1:-1, 2:]
+            walls = grid & between_cells
+            return walls & across, walls & along
+        
+        if loops > 0:
+            across, along = candidate_walls()
+            candidates = np.flatnonzero(across | along)
+            count = min(len(candidates), round(loops * len(candidates)))
+            if count:
+                grid.flat[rng.choice(candidates, count, replace=False)] = False
+                opened += count
+        
+        if dead_ends > 0:
+            across, along = candidate_walls()
+            floor = np.pad(~grid, 1)
+            neighbours = floor[:-2, 1:-1].astype(np.int8) + floor[2:, 1:-1] + floor[1:-1, :-2] + floor[1:-1, 2:]
+            dead = ~grid & (neighbours == 1)
+            
+            # For each direction, dead ends whose wall that way leads into another corridor
+            padded_across, padded_along = np.pad(across, 1), np.pad(along, 1)
+            openable = np.stack([
+                dead & (padded_along if dy else padded_across)[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+                for dy, dx in _DIRECTIONS
+            ])
+            
+            cells = np.flatnonzero(openable.any(axis=0))
+            count = min(len(cells), round(dead_ends * int(dead.sum())))
+            if count:
+                chosen = rng.choice(cells, count, replace=False)
+                # Random valid direction per chosen dead end
+                scores = rng.random((4, count)) * openable.reshape(4, -1)[:, chosen]
+                offsets = _DIRECTIONS[scores.argmax(axis=0)]
+                # Two dead ends can pick the same wall; count it once
+                walls = np.unique(chosen + offsets[:, 0] * width + offsets[:, 1])
+                opened += int(np.count_nonzero(grid.flat[walls]))
+                grid.flat[walls] = False
+        
+        if opened:
+            self.maze = [list(row) for row in grid_to_maze(grid)]
+            self._analysis = None
+        return opened
     
     def get_maze(self):
         """Return the maze as a list of strings"""
         return [''.join(row) for row in self.maze]
     
+    def get_grid(self):
+        """Return the maze as a boolean NumPy array (True = wall)"""
+        return maze_to_grid(self.maze)
+    
+    def get_analysis(self):
+        """Return the analysis for this maze, computing it on first use"""
+        if self._analysis is None:
+            from maze_analysis import analyze_maze
+            self._analysis = analyze_maze(self.get_grid(), self.get_spawn_position())
+        return self._analysis
+    
     def print_maze(self):
         """Print the maze to console"""
         for row in self.maze:
@@ -108,24 +195,47 @@ class MazeGenerator:
                     return x, y
         return 1, 1  # Fallback
 
+def maze_to_grid(maze):
+    """Convert a maze (list of strings or list of lists) to a boolean wall grid.
+    
+    Any character other than '#' counts as floor, so both the '.' and the
+    space floor conventions are accepted.
+    """
+    if isinstance(maze, np.ndarray):
+        return maze.astype(bool, copy=False)
+    
+    rows = [''.join(row) for row in maze]
+    width = len(rows[0]) if rows else 0
+    if any(len(row) != width for row in rows):
+        raise ValueError("Maze rows must all have the same width")
+    
+    data = np.frombuffer(''.join(rows).encode('latin-1'), dtype=np.uint8)
+    return (data == ord('#')).reshape(len(rows), width)
+
+def grid_to_maze(grid, floor='.'):
+    """Convert a boolean wall grid back to a list of strings"""
+    grid = np.asarray(grid, dtype=bool)
+    chars = np.where(grid, ord('#'), ord(floor)).astype(np.uint8)
+    return [row.tobytes().decode('latin-1') for row in chars]
+
 def generate_small_maze():
     """Generate a small maze (good for testing)"""
-    generator = MazeGenerator(15, 15)
+    generator = MazeGenerator(*MAZE_SIZES["small"])
     return generator.get_maze()
 
 def generate_medium_maze():
     """Generate a medium maze"""
-    generator = MazeGenerator(25, 25)
+    generator = MazeGenerator(*MAZE_SIZES["medium"])
     return generator.get_maze()
 
 def generate_large_maze():
     """Generate a large maze"""
-    generator = MazeGenerator(35, 35)
+    generator = MazeGenerator(*MAZE_SIZES["large"])
     return generator.get_maze()
 
 def generate_huge_maze():
     """Generate a huge maze"""
-    generator = MazeGenerator(51, 51)
+    generator = MazeGenerator(*MAZE_SIZES["huge"])
     return generator.get_maze()
 
 def generate_custom_maze(width, height):
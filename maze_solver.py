@@ -0,0 +1,379 @@
+"""
+Maze solver engine for the Enhanced Maze Game
+Shortest paths over a maze grid with BFS, A*, bidirectional BFS and jump point search
+"""
+
+import heapq
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from maze_generator import MAZE_SIZES, MazeGenerator, maze_to_grid
+
+
+class SolveResult(NamedTuple):
+    """Result shared by every solver"""
+    algorithm: str
+    path: List[Tuple[int, int]]  # Tiles from start to goal inclusive, empty if unreachable
+    cost: int                    # Number of moves, -1 if unreachable
+    nodes_expanded: int
+    time: float                  # Seconds
+
+    @property
+    def found(self) -> bool:
+        return self.cost >= 0
+
+
+class _Grid:
+    """Flat, wall-padded copy of a maze grid for fast neighbour lookups"""
+
+    def __init__(self, maze):
+        grid = maze_to_grid(maze)
+        self.height, self.width = grid.shape
+        self.stride = self.width + 2
+        padded = [False] * (self.stride * (self.height + 2))
+        for y, row in enumerate((~grid).tolist()):
+            start = (y + 1) * self.stride + 1
+            padded[start:start + self.width] = row
+        self.open = padded
+        self.offsets = (1, -1, self.stride, -self.stride)
+
+    def index(self, tile: Tuple[int, int]) -> int:
+        return (tile[1] + 1) * self.stride + tile[0] + 1
+
+    def tile(self, index: int) -> Tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return x - 1, y - 1
+
+    def is_open(self, tile: Tuple[int, int]) -> bool:
+        x, y = tile
+        return 0 <= x < self.width and 0 <= y < self.height and self.open[self.index(tile)]
+
+    def walk_back(self, parents: Dict[int, int], node: int) -> List[int]:
+        """Follow parent links back to the root, returning indices root-first"""
+        path = [node]
+        while parents[node] != node:
+            node = parents[node]
+            path.append(node)
+        path.reverse()
+        return path
+
+
+def _result(algorithm, grid, indices, nodes_expanded, started):
+    """Build a SolveResult from a list of padded indices"""
+    elapsed = time.perf_counter() - started
+    if not indices:
+        return SolveResult(algorithm, [], -1, nodes_expanded, elapsed)
+    path = [grid.tile(i) for i in indices]
+    return SolveResult(algorithm, path, len(path) - 1, nodes_expanded, elapsed)
+
+
+def bfs(maze, start, goal) -> SolveResult:
+    """Breadth-first search"""
+    started = time.perf_counter()
+    grid = _Grid(maze)
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return _result("bfs", grid, [], 0, started)
+
+    open_tiles, offsets = grid.open, grid.offsets
+    source, target = grid.index(start), grid.index(goal)
+    parents = {source: source}
+    frontier = deque([source])
+    expanded = 0
+
+    while frontier:
+        node = frontier.popleft()
+        expanded += 1
+        if node == target:
+            return _result("bfs", grid, grid.walk_back(parents, node), expanded, started)
+        for offset in offsets:
+            neighbour = node + offset
+            if open_tiles[neighbour] and neighbour not in parents:
+                parents[neighbour] = node
+                frontier.append(neighbour)
+
+    return _result("bfs", grid, [], expanded, started)
+
+
+def astar(maze, start, goal) -> SolveResult:
+    """A* search with a Manhattan distance heuristic"""
+    started = time.perf_counter()
+    grid = _Grid(maze)
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return _result("astar", grid, [], 0, started)
+
+    open_tiles, offsets, stride = grid.open, grid.offsets, grid.stride
+    source, target = grid.index(start), grid.index(goal)
+    goal_y, goal_x = divmod(target, stride)
+
+    def heuristic(index):
+        y, x = divmod(index, stride)
+        return abs(x - goal_x) + abs(y - goal_y)
+
+    parents = {source: source}
+    costs = {source: 0}
+    heap = [(heuristic(source), 0, source)]
+    closed = set()
+
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        if node == target:
+            return _result("astar", grid, grid.walk_back(parents, node), len(closed), started)
+        for offset in offsets:
+            neighbour = node + offset
+            if open_tiles[neighbour] and cost + 1 < costs.get(neighbour, cost + 2):
+                costs[neighbour] = cost + 1
+                parents[neighbour] = node
+                heapq.heappush(heap, (cost + 1 + heuristic(neighbour), cost + 1, neighbour))
+
+    return _result("astar", grid, [], len(closed), started)
+
+
+def bidirectional_bfs(maze, start, goal) -> SolveResult:
+    """Breadth-first search from both ends, expanding the smaller frontier each round"""
+    started = time.perf_counter()
+    grid = _Grid(maze)
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return _result("bidirectional_bfs", grid, [], 0, started)
+
+    open_tiles, offsets = grid.open, grid.offsets
+    source, target = grid.index(start), grid.index(goal)
+    if source == target:
+        return _result("bidirectional_bfs", grid, [source], 1, started)
+
+    forward_parents = {source: source}
+    backward_parents = {target: target}
+    forward, backward = [source], [target]
+    expanded = 0
+
+    while forward and backward:
+        # Always grow the smaller side
+        swapped = len(forward) > len(backward)
+        if swapped:
+            frontier, parents, others = backward, backward_parents, forward_parents
+        else:
+            frontier, parents, others = forward, forward_parents, backward_parents
+
+        next_frontier = []
+        meeting = None
+        for node in frontier:
+            expanded += 1
+            for offset in offsets:
+                neighbour = node + offset
+                if open_tiles[neighbour] and neighbour not in parents:
+                    parents[neighbour] = node
+                    if neighbour in others:
+                        meeting = neighbour
+                        break
+                    next_frontier.append(neighbour)
+            if meeting is not None:
+                break
+
+        if meeting is not None:
+            head = grid.walk_back(forward_parents, meeting)
+            tail = grid.walk_back(backward_parents, meeting)
+            tail.reverse()
+            return _result("bidirectional_bfs", grid, head + tail[1:], expanded, started)
+
+        if swapped:
+            backward = next_frontier
+        else:
+            forward = next_frontier
+
+    return _result("bidirectional_bfs", grid, [], expanded, started)
+
+
+def jump_point_search(maze, start, goal) -> SolveResult:
+    """
+    Jump point search for 4-connected grids
+
+    Vertical moves scan sideways at every step, horizontal moves run until
+    they hit the goal or a forced neighbour. Only jump points are pushed on
+    the heap, so long corridors cost one expansion instead of one per tile.
+    """
+    started = time.perf_counter()
+    grid = _Grid(maze)
+    if not (grid.is_open(start) and grid.is_open(goal)):
+        return _result("jps", grid, [], 0, started)
+
+    open_tiles, stride = grid.open, grid.stride
+    source, target = grid.index(start), grid.index(goal)
+    goal_y, goal_x = divmod(target, stride)
+
+    def heuristic(index):
+        y, x = divmod(index, stride)
+        return abs(x - goal_x) + abs(y - goal_y)
+
+    def jump_horizontal(node, step):
+        # Perpendicular steps relative to a horizontal move
+        while True:
+            node += step
+            if not open_tiles[node]:
+                return None
+            if node == target:
+                return node
+            behind = node - step
+            if ((open_tiles[node + stride] and not open_tiles[behind + stride]) or
+                    (open_tiles[node - stride] and not open_tiles[behind - stride])):
+                return node
+
+    def jump_vertical(node, step):
+        while True:
+            node += step
+            if not open_tiles[node]:
+                return None
+            if node == target:
+                return node
+            if jump_horizontal(node, 1) is not None or jump_horizontal(node, -1) is not None:
+                return node
+
+    def successors(node, parent):
+        if parent == node:
+            directions = (1, -1, stride, -stride)
+        else:
+            delta = node - parent
+            if abs(delta) < stride:
+                step = 1 if delta > 0 else -1
+                directions = [step]
+                # Forced vertical neighbours
+                behind = node - step
+                for vertical in (stride, -stride):
+                    if open_tiles[node + vertical] and not open_tiles[behind + vertical]:
+                        directions.append(vertical)
+            else:
+                step = stride if delta > 0 else -stride
+                directions = (step, 1, -1)
+
+        for direction in directions:
+            if abs(direction) == 1:
+                jump = jump_horizontal(node, direction)
+            else:
+                jump = jump_vertical(node, direction)
+            if jump is not None:
+                yield jump
+
+    parents = {source: source}
+    costs = {source: 0}
+    heap = [(heuristic(source), 0, source)]
+    closed = set()
+
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node in closed:
+            continue
+        closed.add(node)
+        if node == target:
+            return _result("jps", grid, _expand_jumps(grid.walk_back(parents, node), stride),
+                           len(closed), started)
+        for jump in successors(node, parents[node]):
+            y, x = divmod(node, stride)
+            jump_y, jump_x = divmod(jump, stride)
+            new_cost = cost + abs(jump_x - x) + abs(jump_y - y)
+            if new_cost < costs.get(jump, new_cost + 1):
+                costs[jump] = new_cost
+                parents[jump] = node
+                heapq.heappush(heap, (new_cost + heuristic(jump), new_cost, jump))
+
+    return _result("jps", grid, [], len(closed), started)
+
+
+def _expand_jumps(jump_points: List[int], stride: int) -> List[int]:
+    """Fill in the straight runs between consecutive jump points"""
+    path = jump_points[:1]
+    for node in jump_points[1:]:
+        previous = path[-1]
+        delta = node - previous
+        step = (1 if delta > 0 else -1) if abs(delta) < stride else (stride if delta > 0 else -stride)
+        path.extend(range(previous + step, node + step, step))
+    return path
+
+
+SOLVERS = {
+    "bfs": bfs,
+    "astar": astar,
+    "bidirectional_bfs": bidirectional_bfs,
+    "jps": jump_point_search
+}
+
+
+def solve(maze, start, goal, algorithm: str = "astar") -> SolveResult:
+    """
+    Find the shortest path between two tiles
+
+    Args:
+        maze: Maze as a list of strings, list of lists or boolean wall grid
+        start: Start tile (x, y)
+        goal: Goal tile (x, y)
+        algorithm: One of SOLVERS
+
+    Returns:
+        SolveResult for the chosen algorithm
+    """
+    if algorithm not in SOLVERS:
+        raise ValueError(f"Unknown solver '{algorithm}', expected one of {', '.join(SOLVERS)}")
+    return SOLVERS[algorithm](maze, tuple(start), tuple(goal))
+
+
+def benchmark_solvers(sizes: Optional[Dict[str, Tuple[int, int]]] = None,
+                      mazes_per_size: int = 5, seed: int = 0) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """
+    Time every solver on generated mazes of each size
+
+    Each maze is solved from spawn to the tile farthest from spawn, which is
+    the hardest query the maze offers.
+
+    Args:
+        sizes: Name -> (width, height); defaults to the generate_*_maze sizes
+        mazes_per_size: Number of mazes generated per size
+        seed: Random seed so runs are comparable
+
+    Returns:
+        {size: {algorithm: {"time_ms", "nodes_expanded", "cost"}}} averaged over mazes
+    """
+    sizes = sizes or MAZE_SIZES
+    results = {}
+
+    for size_name, (width, height) in sizes.items():
+        totals = {name: {"time_ms": 0.0, "nodes_expanded": 0.0, "cost": 0.0} for name in SOLVERS}
+
+        for maze_number in range(mazes_per_size):
+            generator = MazeGenerator(width, height, seed=seed + maze_number)
+            grid = generator.get_grid()
+            analysis = generator.get_analysis()
+            start, goal = analysis["spawn"], analysis["goal"]
+
+            for name, solver in SOLVERS.items():
+                result = solver(grid, start, goal)
+                if result.cost != analysis["solution_length"]:
+                    raise RuntimeError(f"{name} returned cost {result.cost}, expected {analysis['solution_length']}")
+                totals[name]["time_ms"] += result.time * 1000
+                totals[name]["nodes_expanded"] += result.nodes_expanded
+                totals[name]["cost"] += result.cost
+
+        results[size_name] = {
+            name: {key: value / mazes_per_size for key, value in stats.items()}
+            for name, stats in totals.items()
+        }
+
+    return results
+
+
+if __name__ == "__main__":
+    sizes = dict(MAZE_SIZES)
+    sizes["xl"] = (101, 101)
+    sizes["xxl"] = (201, 201)
+
+    print("Benchmarking maze solvers...")
+    results = benchmark_solvers(sizes)
+
+    for size_name, stats in results.items():
+        width, height = sizes[size_name]
+        print(f"\n{size_name} ({width}x{height})")
+        print(f"  {'algorithm':<18} {'time (ms)':>10} {'expanded':>10} {'cost':>8}")
+        for name, row in sorted(stats.items(), key=lambda item: item[1]["time_ms"]):
+            print(f"  {name:<18} {row['time_ms']:>10.3f} {row['nodes_expanded']:>10.0f} {row['cost']:>8.0f}")
+        winner = min(stats, key=lambda name: stats[name]["time_ms"])
+        print(f"  fastest: {winner}")
@@ -0,0 +1,179 @@
+"""
+Text maze files for the Enhanced Maze Game
+Streams hand-made maze files such as custom_map.txt line by line straight
+into the compact grid, and writes grids back out as text
+"""
+
+import io
+import os
+from contextlib import nullcontext
+from typing import IO, Iterator, Union
+
+import numpy as np
+
+from maze_generator import maze_to_grid
+
+WALL = ord('#')
+# Both floor conventions: '.' from the generator, ' ' from hand-made maps
+FLOOR_CHARS = b". "
+
+_VALID = np.zeros(256, dtype=bool)
+_VALID[WALL] = True
+_VALID[list(FLOOR_CHARS)] = True
+
+Source = Union[str, os.PathLike, IO[bytes]]
+
+
+def _open_source(source: Source):
+    """Open a path in binary mode; files passed in are used as-is and left open"""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, "rb")
+    if isinstance(source, io.TextIOBase):
+        if hasattr(source, "buffer"):
+            return nullcontext(source.buffer)
+        # In-memory text (io.StringIO) has no byte buffer underneath
+        return nullcontext(line.encode("utf-8") for line in source)
+    return nullcontext(source)
+
+
+def _iter_lines(source: Source) -> Iterator[bytes]:
+    """Yield maze rows as bytes, without line endings or trailing blank lines"""
+    with _open_source(source) as f:
+        blank_lines = 0
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if not line:
+                blank_lines += 1
+                continue
+            if blank_lines:
+                # Blank lines only count once something follows them
+                yield from (b"" for _ in range(blank_lines))
+                blank_lines = 0
+            yield line
+
+
+def _check_width(length: int, number: int, width: int):
+    if length != width:
+        raise ValueError(f"Row {number} has width {length}, expected {width}")
+
+
+def _check_chars(data: np.ndarray, first_row: int, width: int):
+    """Validate the characters of one or more whole rows given as one flat array"""
+    bad = ~_VALID[data]
+    if bad.any():
+        index = int(np.argmax(bad))
+        row, column = divmod(index, width)
+        raise ValueError(f"Row {first_row + row} has unexpected character {chr(data[index])!r} at column {column}")
+
+
+def _check_row(row: np.ndarray, number: int, width: int):
+    _check_width(len(row), number, width)
+    _check_chars(row, number, width)
+
+
+def iter_text_rows(source: Source) -> Iterator[np.ndarray]:
+    """
+    Stream a text maze as boolean wall rows (True = wall)
+
+    Only one row is held at a time, so the result can be fed straight into
+    chunked_map.write_chunked_map for mazes too big to load.
+
+    Args:
+        source: File path or binary/text file object
+
+    Yields:
+        One boolean row per line
+    """
+    width = None
+    for number, line in enumerate(_iter_lines(source)):
+        row = np.frombuffer(line, dtype=np.uint8)
+        if width is None:
+            width = len(row)
+        _check_row(row, number, width)
+        yield row == WALL
+
+
+def load_maze_text(source: Source) -> np.ndarray:
+    """
+    Load a text maze into the compact grid
+
+    Walls are '#'; '.' and ' ' are both floor. Row widths are checked as
+    rows are read and appended to one byte buffer; the characters are then
+    checked, and the grid built, in single vectorized passes.
+
+    Args:
+        source: File path or binary/text file object
+
+    Returns:
+        Boolean wall grid (True = wall)
+    """
+    buffer = bytearray()
+    width = None
+    height = 0
+    for line in _iter_lines(source):
+        if width is None:
+            width = len(line)
+        _check_width(len(line), height, width)
+        buffer += line
+        height += 1
+
+    if not height or not width:
+        raise ValueError("Maze file is empty")
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    _check_chars(data, 0, width)
+    return (data == WALL).reshape(height, width)
+
+
+def save_maze_text(path: Union[str, os.PathLike], maze, floor: str = " ", newline: str = "\n"):
+    """
+    Write a maze as text, one row at a time
+
+    Args:
+        path: Output file path
+        maze: Boolean wall grid, list of strings or iterable of boolean rows
+        floor: Floor character, '.' or ' '
+        newline: Line ending to write
+    """
+    if len(floor) != 1 or floor.encode("ascii") not in (b".", b" "):
+        raise ValueError("Floor must be '.' or ' '")
+
+    table = np.array([ord(floor), WALL], dtype=np.uint8)
+    ending = newline.encode("ascii")
+    if isinstance(maze, list) and maze and isinstance(maze[0], (str, list)):
+        maze = maze_to_grid(maze)
+
+    width = None
+    with open(path, "wb") as f:
+        for number, row in enumerate(maze):
+            row = np.asarray(row, dtype=bool)
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise ValueError(f"Row {number} has width {len(row)}, expected {width}")
+            f.write(table[row.view(np.uint8)].tobytes())
+            f.write(ending)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from maze_generator import MazeGenerator
+
+    grid = load_maze_text("custom_map.txt")
+    print(f"custom_map.txt: {grid.shape[1]} x {grid.shape[0]} tiles, {int((~grid).sum())} floor")
+
+    size = 2001
+    generator_start = time.perf_counter()
+    big = MazeGenerator(size, size, seed=3).get_grid()
+    generate_time = time.perf_counter() - generator_start
+
+    path = os.path.join(tempfile.gettempdir(), "maze_text_demo.txt")
+    save_maze_text(path, big)
+    start = time.perf_counter()
+    loaded = load_maze_text(path)
+    load_time = time.perf_counter() - start
+    assert np.array_equal(loaded, big)
+    print(f"{size}x{size} ({os.path.getsize(path) / 1e6:.1f} MB): "
+          f"generated in {generate_time:.2f}s, loaded in {load_time * 1000:.0f}ms")
+    os.remove(path)
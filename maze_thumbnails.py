@@ -0,0 +1,187 @@
+"""
+Maze thumbnails for the Enhanced Maze Game
+Renders maze grids straight to small PNG files with NumPy and zlib (no
+display or pygame needed) and caches them on disk by content hash
+"""
+
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from maze_codec import maze_hash
+from maze_generator import maze_to_grid
+
+DEFAULT_SIZE = 128
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".maze_game", "thumbnails")
+
+# Same greys as the minimap in draw_map
+WALL_COLOR = (200, 200, 200)
+FLOOR_COLOR = (100, 100, 100)
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """Encode an (height, width, 3) uint8 array as an RGB PNG"""
+    height, width, _ = pixels.shape
+    # Every scanline starts with filter type 0 (none)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, width * 3)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header) +
+            _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + _png_chunk(b"IEND", b""))
+
+
+def render_thumbnail(maze, size: int = DEFAULT_SIZE) -> np.ndarray:
+    """
+    Render a maze to an RGB pixel array no larger than size x size
+
+    Small mazes are scaled up by a whole number of pixels per tile; big
+    ones are averaged down in blocks, so thin corridors show as shades
+    instead of disappearing.
+
+    Args:
+        maze: Maze as a list of strings, list of lists or boolean wall grid
+        size: Longest side of the thumbnail in pixels
+
+    Returns:
+        (height, width, 3) uint8 array
+    """
+    grid = maze_to_grid(maze)
+    height, width = grid.shape
+    longest = max(height, width)
+
+    if longest <= size:
+        scale = size // longest
+        wall_share = np.repeat(np.repeat(grid, scale, axis=0), scale, axis=1).astype(np.float32)
+    else:
+        block = -(-longest // size)
+        padded = np.ones((-(-height // block) * block, -(-width // block) * block), dtype=np.float32)
+        padded[:height, :width] = grid
+        wall_share = padded.reshape(padded.shape[0] // block, block, padded.shape[1] // block, block).mean(axis=(1, 3))
+
+    wall = np.array(WALL_COLOR, dtype=np.float32)
+    floor = np.array(FLOOR_COLOR, dtype=np.float32)
+    return (floor + wall_share[..., None] * (wall - floor)).round().astype(np.uint8)
+
+
+def thumbnail_path(content_hash: str, size: int = DEFAULT_SIZE, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """Cache location of a thumbnail"""
+    return os.path.join(cache_dir, f"{content_hash}_{size}.png")
+
+
+def cached_thumbnail(content_hash: str, size: int = DEFAULT_SIZE, cache_dir: str = DEFAULT_CACHE_DIR) -> Optional[str]:
+    """Return the cached thumbnail path for a content hash, or None if it hasn't been rendered"""
+    if not content_hash:
+        return None
+    path = thumbnail_path(content_hash, size, cache_dir)
+    return path if os.path.exists(path) else None
+
+
+def _render_to_file(job: Tuple[np.ndarray, int, str]) -> str:
+    """Worker entry point: render one thumbnail and write it atomically"""
+    grid, size, path = job
+    data = encode_png(render_thumbnail(grid, size))
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return path
+
+
+def render_thumbnails(mazes, size: int = DEFAULT_SIZE, cache_dir: str = DEFAULT_CACHE_DIR,
+                      max_workers: int = None, executor: ProcessPoolExecutor = None) -> List[str]:
+    """
+    Render thumbnails for many mazes, skipping any already in the cache
+
+    Args:
+        mazes: Mazes as lists of strings, lists of lists or boolean wall grids
+        size: Longest side of each thumbnail in pixels
+        cache_dir: Directory thumbnails are cached in
+        max_workers: Worker processes for cache misses (defaults to the CPU count)
+        executor: Existing pool to reuse instead of starting a new one
+
+    Returns:
+        Thumbnail paths, in the same order as mazes
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    paths = []
+    jobs = {}
+    for maze in mazes:
+        grid = maze_to_grid(maze)
+        path = thumbnail_path(maze_hash(grid), size, cache_dir)
+        paths.append(path)
+        if path not in jobs and not os.path.exists(path):
+            jobs[path] = (grid, size, path)
+
+    if executor is not None:
+        list(executor.map(_render_to_file, jobs.values()))
+    elif len(jobs) >= 4:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(_render_to_file, jobs.values()))
+    else:
+        # A process pool only pays for itself once there are a few mazes to draw
+        for job in jobs.values():
+            _render_to_file(job)
+
+    return paths
+
+
+def record_thumbnails(handler, records: List[Dict], size: int = DEFAULT_SIZE,
+                      cache_dir: str = DEFAULT_CACHE_DIR, max_workers: int = None) -> Dict[int, str]:
+    """
+    Thumbnails for maze records, downloading only the layouts not already cached
+
+    Args:
+        handler: GameSupabaseHandler used to fetch missing layouts
+        records: Maze records, e.g. from get_public_mazes(include_data=False)
+        size: Longest side of each thumbnail in pixels
+        cache_dir: Directory thumbnails are cached in
+        max_workers: Worker processes for cache misses
+
+    Returns:
+        Dictionary of maze ID to thumbnail path
+    """
+    thumbnails = {}
+    missing = []
+    for record in records:
+        path = cached_thumbnail(record.get("content_hash"), size, cache_dir)
+        if path:
+            thumbnails[record["id"]] = path
+        else:
+            missing.append(record)
+
+    layouts = {record["id"]: record["maze_data"] for record in missing if record.get("maze_data")}
+    layouts.update(handler.get_maze_layouts([record["id"] for record in missing if record["id"] not in layouts]))
+
+    maze_ids = list(layouts)
+    paths = render_thumbnails([layouts[maze_id] for maze_id in maze_ids], size, cache_dir, max_workers)
+    thumbnails.update(zip(maze_ids, paths))
+    return thumbnails
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from maze_batch import generate_batch
+
+    grids = generate_batch(64, 101, 101, seed=0)
+    cache_dir = os.path.join(tempfile.gettempdir(), "maze_thumbnail_demo")
+
+    start = time.perf_counter()
+    paths = render_thumbnails(grids, cache_dir=cache_dir)
+    first_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    render_thumbnails(grids, cache_dir=cache_dir)
+    cached_time = time.perf_counter() - start
+
+    print(f"{len(paths)} thumbnails: rendered in {first_time:.2f}s, "
+          f"cache hits in {cached_time * 1000:.0f}ms ({os.path.getsize(paths[0])} bytes each)")
@@ -0,0 +1,194 @@
+"""
+Endless procedural maze world for the Enhanced Maze Game
+Chunks are generated from (world seed, chunk x, chunk y) as the player
+approaches and evicted from an LRU cache once they are far away
+"""
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from maze_generator import MazeGenerator
+
+DEFAULT_CHUNK_SIZE = 32
+
+
+def chunk_seed(world_seed: int, chunk_x: int, chunk_y: int) -> int:
+    """Stable 64-bit seed for one chunk (independent of PYTHONHASHSEED)"""
+    digest = hashlib.blake2b(f"{world_seed}:{chunk_x}:{chunk_y}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def generate_chunk(world_seed: int, chunk_x: int, chunk_y: int,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[List[int]]:
+    """
+    Build one chunk of the world as rows of 0/1 (1 = wall)
+
+    Every chunk is a MazeGenerator maze one tile larger than the chunk with
+    its last row and column dropped, so cells sit on odd world coordinates
+    everywhere. A chunk owns its west and north border walls and always
+    opens at least one door in each; since border cells on both sides are
+    always floor, neighbouring chunks connect without knowing each other.
+    """
+    generator = MazeGenerator(chunk_size + 1, chunk_size + 1, seed=chunk_seed(world_seed, chunk_x, chunk_y))
+    rows = [[1 if cell == '#' else 0 for cell in row[:chunk_size]] for row in generator.maze[:chunk_size]]
+
+    # Doors use the generator's random stream, so they are deterministic too
+    rng = generator.rng
+    cells = range(1, chunk_size, 2)
+    for _ in range(rng.randint(1, 2)):
+        if chunk_x > 0:
+            rows[rng.choice(cells)][0] = 0
+        if chunk_y > 0:
+            rows[0][rng.choice(cells)] = 0
+    return rows
+
+
+class MazeWorld:
+    """
+    Endless maze covering every tile with x >= 0 and y >= 0
+
+    Exposes the same is_wall() lookup as ChunkedMap. Chunks are built on a
+    background thread ahead of the player; a chunk that isn't ready yet
+    reads as solid wall for a frame rather than blocking the frame on
+    generation. Walls are forgotten with evicted chunks and rebuilt from the
+    seed on return; fog of war (one byte per tile) is kept for every chunk
+    visited, so a revisited chunk keeps its explored tiles and they aren't
+    counted twice.
+    """
+
+    def __init__(self, seed: int, chunk_size: int = DEFAULT_CHUNK_SIZE, cache_chunks: int = 64,
+                 prefetch_radius: int = 2):
+        if chunk_size < 8 or chunk_size & (chunk_size - 1):
+            raise ValueError("Chunk size must be a power of two of at least 8")
+
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.cache_chunks = cache_chunks
+        self.prefetch_radius = prefetch_radius
+
+        # Same shape as a ChunkedMap so MazeGame can treat both alike
+        self.width = math.inf
+        self.height = math.inf
+        self.floor_tiles = math.inf
+        self.spawn = [1, 1]
+        self.metadata = {"floor_tiles": math.inf, "spawn": self.spawn, "world_seed": seed}
+
+        self._shift = chunk_size.bit_length() - 1
+        self._mask = chunk_size - 1
+        self._chunks = OrderedDict()  # (cx, cy) -> (wall rows, explored bytearray)
+        # Explored tiles outlive evicted chunks, so a revisited chunk isn't counted again
+        self._explored = {}  # (cx, cy) -> explored bytearray
+        self._lock = threading.Lock()
+        self._requested = set()
+        self._wanted = threading.Condition(self._lock)
+        self._stopping = False
+        self._last_key = None
+        self._last_chunk = None
+
+        self.explored_count = 0
+        self.chunk_loads = 0
+
+        # The spawn chunk is built up front so the first frame has something to stand on
+        self._store((0, 0), generate_chunk(seed, 0, 0, chunk_size))
+
+        self._thread = threading.Thread(target=self._generate_loop, name="MazeWorld", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop the generation thread"""
+        with self._lock:
+            self._stopping = True
+            self._wanted.notify()
+        self._thread.join()
+
+    def _store(self, key, rows):
+        with self._lock:
+            explored = self._explored.get(key)
+            if explored is None:
+                explored = self._explored[key] = bytearray(self.chunk_size * self.chunk_size)
+            self._chunks[key] = (rows, explored)
+            self._chunks.move_to_end(key)
+            # is_wall may keep using an evicted chunk it last read; that's harmless
+            while len(self._chunks) > self.cache_chunks:
+                self._chunks.popitem(last=False)
+            self._requested.discard(key)
+            self.chunk_loads += 1
+
+    def _generate_loop(self):
+        while True:
+            with self._lock:
+                while not self._requested and not self._stopping:
+                    self._wanted.wait()
+                if self._stopping:
+                    return
+                key = min(self._requested, key=self._distance_to_last)
+            self._store(key, generate_chunk(self.seed, key[0], key[1], self.chunk_size))
+
+    def _distance_to_last(self, key):
+        # Build the chunks nearest the player first
+        if self._last_key is None:
+            return 0
+        return abs(key[0] - self._last_key[0]) + abs(key[1] - self._last_key[1])
+
+    def _entry(self, key) -> Optional[Tuple[List[List[int]], bytearray]]:
+        """Return a cached chunk (refreshing its LRU position) or queue it and return None"""
+        with self._lock:
+            entry = self._chunks.get(key)
+            if entry is not None:
+                self._chunks.move_to_end(key)
+            elif key not in self._requested:
+                self._requested.add(key)
+                self._wanted.notify()
+            return entry
+
+    def request_around(self, col: int, row: int):
+        """Queue every missing chunk within prefetch_radius chunks of a tile"""
+        center_x, center_y = col >> self._shift, row >> self._shift
+        radius = self.prefetch_radius
+        for chunk_y in range(max(0, center_y - radius), center_y + radius + 1):
+            for chunk_x in range(max(0, center_x - radius), center_x + radius + 1):
+                self._entry((chunk_x, chunk_y))
+
+    def is_wall(self, col: int, row: int) -> bool:
+        """Check a tile; negative coordinates and chunks still being built count as wall"""
+        if col < 0 or row < 0:
+            return True
+
+        key = (col >> self._shift, row >> self._shift)
+        # Rays and sweeps stay in one chunk for many lookups in a row
+        if key != self._last_key:
+            entry = self._entry(key)
+            if entry is None:
+                return True
+            self._last_key, self._last_chunk = key, entry
+        return self._last_chunk[0][row & self._mask][col & self._mask] == 1
+
+    def mark_explored(self, col: int, row: int):
+        """Record a tile as explored (ignored if its chunk isn't loaded)"""
+        if col < 0 or row < 0:
+            return
+        entry = self._entry((col >> self._shift, row >> self._shift))
+        if entry is None:
+            return
+        index = (row & self._mask) * self.chunk_size + (col & self._mask)
+        if not entry[1][index]:
+            entry[1][index] = 1
+            self.explored_count += 1
+
+    def is_explored(self, col: int, row: int) -> bool:
+        """Check whether a tile has been explored"""
+        if col < 0 or row < 0:
+            return False
+        with self._lock:
+            explored = self._explored.get((col >> self._shift, row >> self._shift))
+        if explored is None:
+            return False
+        return explored[(row & self._mask) * self.chunk_size + (col & self._mask)] == 1
+
+    @property
+    def loaded_chunks(self) -> int:
+        """Number of chunks currently cached"""
+        return len(self._chunks)
@@ -1,20 +1,26 @@
-import pygame
-import sys
-import subprocess
-import json
-import os
-import time
-from supabase_handler import GameSupabaseHandler
-from chat_interface import ChatInterface, FriendChatWindow
+import startup_trace
+
+with startup_trace.phase("import"):
+    import pygame
+    import sys
+    import os
+    import time
+    import threading
+    from db_broker import open_db_handler
+    from chat_interface import ChatInterface, FriendChatWindow
+    from game_ipc import GameProcess
+
+# Run each game in its own process (talking over pipes) instead of in the menu's window
+SEPARATE_GAME_PROCESS = os.environ.get("MAZE_GAME_SEPARATE_PROCESS") == "1"
 
 class MenuApplication:
     def __init__(self):
-        pygame.init()
-        
-        self.SCREEN_WIDTH = 800
-        self.SCREEN_HEIGHT = 600
-        self.win = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
-        pygame.display.set_caption("Maze Game - Main Menu")
+        with startup_trace.phase("SDL init"):
+            pygame.init()
+            
+            self.SCREEN_WIDTH = 800
+            self.SCREEN_HEIGHT = 600
+            self.open_menu_window()
         self.clock = pygame.time.Clock()
         
         # Colors
@@ -27,10 +33,11 @@ class MenuApplication:
         self.YELLOW = (255, 255, 0)
         self.GOLD = (255, 215, 0)
         
-        # Initialize database
+        # Initialize database; the client connects in the background so the
+        # menu doesn't wait on the network (first use waits for it instead)
         try:
-            self.db_handler = GameSupabaseHandler()
-            print("✅ Database connected successfully!")
+            self.db_handler = open_db_handler(lazy=True)
+            threading.Thread(target=self.connect_database, daemon=True).start()
         except Exception as e:
             print(f"❌ Database connection failed: {e}")
             self.db_handler = None
@@ -61,6 +68,21 @@ class MenuApplication:
         self.chat_visible = False
         self.chat_type = "game"  # "game", "global", "friend"
         self.selected_friend_id = None
+        
+        # Game running in a separate process, if any, and an idle worker
+        # already warmed up for the next one
+        self.game_process = None
+        self.warm_game = None
+        if SEPARATE_GAME_PROCESS:
+            self.prepare_game_process()
+    
+    def connect_database(self):
+        """Background thread: create the database client and restore the session"""
+        try:
+            self.db_handler.connect()
+            print("✅ Database connected successfully!")
+        except Exception as e:
+            print(f"❌ Database connection failed: {e}")
     
     def draw_text(self, text, x, y, color=None, font_size=24, center=False):
         """Helper function to draw text"""
@@ -75,50 +97,119 @@ class MenuApplication:
         self.win.blit(text_surface, (x, y))
         return text_surface.get_height()
     
+    def open_menu_window(self):
+        """Size the shared window for the menu (also after returning from a game)"""
+        self.win = pygame.display.set_mode((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        pygame.display.set_caption("Maze Game - Main Menu")
+    
+    def game_config(self):
+        """Build the configuration handed to a game"""
+        config = {
+            'player_name': 'Guest',
+            'user_id': None,
+            'session_data': None
+        }
+        
+        # Add user data if authenticated
+        if self.db_handler and self.db_handler.is_authenticated():
+            user = self.db_handler.get_current_user()
+            if user:
+                config['player_name'] = user['username']
+                config['user_id'] = user['id']
+                config['session_data'] = self.db_handler.get_session_data()
+        return config
+    
     def start_game(self):
-        """Launch the game application"""
+        """Switch the window to the game scene and come back when it ends"""
+        if SEPARATE_GAME_PROCESS:
+            self.start_game_process()
+            return
+        
+        result = None
         try:
-            # Prepare game configuration
-            config = {
-                'player_name': 'Guest',
-                'user_id': None,
-                'session_data': None
-            }
-            
-            # Add user data if authenticated
-            if self.db_handler and self.db_handler.is_authenticated():
-                user = self.db_handler.get_current_user()
-                if user:
-                    config['player_name'] = user['username']
-                    config['user_id'] = user['id']
-                    config['session_data'] = self.db_handler.get_session_data()
-            
-            # Save config to file
-            with open('game_config.json', 'w') as f:
-                json.dump(config, f)
-            
             print("🎮 Launching game...")
+            # Imported on first play: the engine (and its first maze) isn't needed for the menu
+            from maze_game import MazeGame
             
-            # Launch game process
-            subprocess.run([sys.executable, 'maze_game.py'], check=True)
-            
-            # Game has returned, check for results
-            self.process_game_result()
+            # Same process, window and database handler: no re-import, no
+            # session restore, no second connection
+            game = MazeGame(self.game_config(), db_handler=self.db_handler)
+            result = game.run()
             
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             self.error_message = f"Game crashed: {e}"
-            print(f"❌ Game process failed: {e}")
+            print(f"❌ Game failed: {e}")
+        
+        # Back to the menu scene
+        self.open_menu_window()
+        pygame.event.clear()
+        
+        if result is not None:
+            self.process_game_result(result)
+            if result.get('quit'):
+                pygame.quit()
+                sys.exit(0)
+    
+    def prepare_game_process(self):
+        """Start a worker process that warms up in the background until the next game"""
+        try:
+            self.warm_game = GameProcess()
         except Exception as e:
-            self.error_message = f"Failed to start game: {e}"
-            print(f"❌ Failed to start game: {e}")
+            print(f"⚠️ Could not start game worker: {e}")
+            self.warm_game = None
     
-    def process_game_result(self):
-        """Process the result from the completed game"""
+    def start_game_process(self):
+        """Launch the game in its own process; the menu keeps running and shows its progress"""
+        if self.game_process is not None:
+            self.error_message = "Game already running"
+            return
+        config = self.game_config()
+        worker, self.warm_game = self.warm_game, None
         try:
-            if os.path.exists('game_result.json'):
-                with open('game_result.json', 'r') as f:
-                    result = json.load(f)
-                
+            if worker is not None and worker.is_running:
+                try:
+                    worker.start(config)
+                    print("🎮 Starting game in warm worker...")
+                except OSError:
+                    worker.close()
+                    worker = None
+            else:
+                worker = None
+            if worker is None:
+                print("🎮 Launching game process...")
+                worker = GameProcess(config)
+            self.game_process = worker
+        except Exception as e:
+            self.error_message = f"Failed to launch game: {e}"
+            print(f"❌ Failed to launch game: {e}")
+    
+    def poll_game_process(self):
+        """Pick up progress and the final result from a separate game process"""
+        if self.game_process is None:
+            return
+        result = self.game_process.poll()
+        if result is None:
+            return
+        
+        self.game_process.close()
+        self.game_process = None
+        # Warm up the next worker while the player is back in the menu
+        self.prepare_game_process()
+        if 'error' in result:
+            self.error_message = f"Game crashed: {result['error']}"
+            print(f"❌ Game failed: {result['error']}")
+        else:
+            self.process_game_result(result)
+    
+    def process_game_result(self, result):
+        """
+        Process the result from the completed game
+        
+        Args:
+            result: Result returned by MazeGame.run (in-process or over game_ipc)
+        """
+        try:
+            if result is not None:
                 # Display result message
                 if result['completed']:
                     self.success_message = f"Game completed! Score: {result['score']}, Time: {result['completion_time']:.1f}s"
@@ -138,11 +229,6 @@ class MenuApplication:
                     except Exception as e:
                         print(f"❌ Failed to save guest progress: {e}")
                 
-                # Clean up
-                os.remove('game_result.json')
-                if os.path.exists('game_config.json'):
-                    os.remove('game_config.json')
-                
                 print(f"🎮 Game result processed: {result}")
                 
         except Exception as e:
@@ -195,6 +281,14 @@ class MenuApplication:
         if self.success_message:
             self.draw_text(self.success_message, self.SCREEN_WIDTH // 2, 350, self.GREEN, 16, center=True)
         
+        # Live progress of a game running in its own process
+        if self.game_process is not None:
+            progress = self.game_process.progress
+            status = "Game running..." if progress is None else (
+                f"Game running - Level {progress['level']}, Score {progress['score']}, "
+                f"Explored {progress['explored']}, {progress['time']}s")
+            self.draw_text(status, self.SCREEN_WIDTH // 2, 375, self.YELLOW, 16, center=True)
+        
         # Draw chat interface if visible
         if self.chat_visible:
             self.chat_interface.draw(self.win)
@@ -726,6 +820,7 @@ class MenuApplication:
     
     def run(self):
         """Main menu loop"""
+        first_frame = True
         while True:
             # Handle events
             for event in pygame.event.get():
@@ -750,6 +845,8 @@ class MenuApplication:
                     if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                         self.game_state = "menu"
             
+            self.poll_game_process()
+            
             # Update chat if visible
             if self.chat_visible or self.game_state == "chat":
                 self.chat_interface.update()
@@ -775,9 +872,12 @@ class MenuApplication:
                 self.draw_chat_screen()
             
             pygame.display.flip()
+            if first_frame:
+                startup_trace.mark("first frame")
+                first_frame = False
             self.clock.tick(30)  # Lower FPS for menu is fine
 
 
 if __name__ == "__main__":
     menu = MenuApplication()
-    menu.run()
\ No newline at end of file
+    menu.run()
\ No newline at end of file
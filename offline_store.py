@@ -0,0 +1,302 @@
+"""
+Offline support for the Enhanced Maze Game
+A local SQLite file holds a journal of database writes not yet sent and
+the last good copy of maze and leaderboard reads, and an HTTP transport
+wrapper answers those reads from the copies while the server can't be
+reached
+"""
+
+import base64
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".maze_game", "offline.sqlite3")
+
+# Seconds to treat the server as unreachable after a connection failure
+# before trying it again; until then requests fail (or are answered) at once
+OFFLINE_RETRY = 10.0
+
+# Seconds a writer may hold the journal before another one may take over
+JOURNAL_LEASE = 30.0
+
+# Read snapshots kept; the least recently refreshed are dropped first
+SNAPSHOT_LIMIT = 500
+
+# Tables whose reads are kept for offline use: mazes and leaderboards. Auth,
+# profile and chat reads are never written to disk.
+SNAPSHOT_TABLES = ("mazes", "player_progress")
+
+# Journal owner for writes made with no one signed in (guest rows anyone may insert)
+ANON_OWNER = "anon"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    write_id TEXT NOT NULL UNIQUE,
+    owner TEXT,
+    job TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS journal_leases (
+    owner TEXT PRIMARY KEY,
+    writer TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    key TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def is_offline_error(error: Exception) -> bool:
+    """True for failures to reach the server, as opposed to the server rejecting a request"""
+    if isinstance(error, OSError):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+class OfflineStore:
+    """
+    Write journal and read snapshots in one SQLite file
+
+    The file may be shared by several processes (menu, game, broker). Each
+    write belongs to the user who made it and is only handed to a writer
+    signed in as that user, so it is sent with that user's permissions. Per
+    user, only the writer holding that user's lease sends, so writes go out
+    in the order they were made, whichever process made them.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    # ==================== WRITE JOURNAL ====================
+
+    def append(self, job: Dict[str, Any], owner: str) -> str:
+        """
+        Record a write to send
+
+        Args:
+            job: The write
+            owner: User id the write is made as (ANON_OWNER for guests)
+
+        Returns:
+            The write's idempotency key
+        """
+        write_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("INSERT INTO journal (write_id, owner, job, created_at) VALUES (?, ?, ?, ?)",
+                             (write_id, owner, json.dumps(job, default=str), time.time()))
+        return write_id
+
+    def claim(self, writer: str, owner: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        """
+        Take (or renew) an owner's journal lease and return their oldest writes
+
+        Args:
+            writer: Id of the claiming writer
+            owner: User id the writer is signed in as (ANON_OWNER for a
+                guest); None claims nothing
+
+        Returns:
+            Up to limit journal entries (seq, write_id, job), or none if
+            another writer holds the owner's lease
+        """
+        if owner is None:
+            return []
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                lease = self._db.execute("SELECT writer, expires_at FROM journal_leases WHERE owner = ?",
+                                         (owner,)).fetchone()
+                if lease and lease[0] != writer and lease[1] > now:
+                    self._db.execute("COMMIT")
+                    return []
+                rows = self._db.execute("SELECT seq, write_id, job FROM journal WHERE owner = ? ORDER BY seq LIMIT ?",
+                                        (owner, limit)).fetchall()
+                if rows:
+                    self._db.execute("INSERT OR REPLACE INTO journal_leases (owner, writer, expires_at) VALUES (?, ?, ?)",
+                                     (owner, writer, now + JOURNAL_LEASE))
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return [{"seq": seq, "write_id": write_id, "job": json.loads(job)} for seq, write_id, job in rows]
+
+    def complete(self, seqs: List[int]):
+        """Remove writes that have been sent (or permanently rejected)"""
+        if not seqs:
+            return
+        with self._lock:
+            self._db.executemany("DELETE FROM journal WHERE seq = ?", [(seq,) for seq in seqs])
+
+    def release(self, writer: str):
+        """Give up a writer's journal leases so another writer can continue"""
+        with self._lock:
+            self._db.execute("DELETE FROM journal_leases WHERE writer = ?", (writer,))
+
+    def pending(self, owner: str = None) -> int:
+        """Writes in the journal from any process; only one owner's if given"""
+        with self._lock:
+            if owner is None:
+                return self._db.execute("SELECT COUNT(*) FROM journal").fetchone()[0]
+            return self._db.execute("SELECT COUNT(*) FROM journal WHERE owner = ?", (owner,)).fetchone()[0]
+
+    # ==================== READ SNAPSHOTS ====================
+
+    def save_snapshot(self, key: str, status: int, headers: Dict[str, str], body: bytes):
+        """Keep the latest good response for a read"""
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO snapshots (key, status, headers, body, synced_at) "
+                             "VALUES (?, ?, ?, ?, ?)", (key, status, json.dumps(headers), body, time.time()))
+            self._db.execute("DELETE FROM snapshots WHERE key NOT IN "
+                             "(SELECT key FROM snapshots ORDER BY synced_at DESC LIMIT ?)", (SNAPSHOT_LIMIT,))
+
+    def load_snapshot(self, key: str) -> Optional[Dict[str, Any]]:
+        """The last good response for a read, or None if it was never made online"""
+        with self._lock:
+            row = self._db.execute("SELECT status, headers, body, synced_at FROM snapshots WHERE key = ?",
+                                   (key,)).fetchone()
+        if row is None:
+            return None
+        status, headers, body, synced_at = row
+        return {"status": status, "headers": json.loads(headers), "body": body, "synced_at": synced_at}
+
+
+_stores: Dict[str, OfflineStore] = {}
+_stores_lock = threading.Lock()
+
+
+def default_store(path: str = DEFAULT_STORE_PATH) -> OfflineStore:
+    """The process-wide store for a path"""
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = OfflineStore(path)
+        return _stores[path]
+
+
+def _token_identity(authorization: str) -> str:
+    """
+    Who a bearer token acts as: its user id (JWT "sub"), else its role
+
+    The token itself changes on every session refresh; who it belongs to
+    doesn't. The token isn't verified here, only used to pick a snapshot.
+    """
+    token = authorization.split(" ", 1)[-1]
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return str(claims.get("sub") or claims.get("role") or "anon")
+    except (IndexError, ValueError, AttributeError):
+        return "anon"
+
+
+def _snapshot_table(request) -> Optional[str]:
+    """Table a PostgREST GET reads, if it is one kept for offline use"""
+    path = request.url.path
+    if request.method != "GET" or "/rest/v1/" not in path:
+        return None
+    table = path.split("/rest/v1/", 1)[1].split("/")[0]
+    return table if table in SNAPSHOT_TABLES else None
+
+
+def _snapshot_key(request) -> str:
+    # Different users see different rows, so who is asking is part of the key
+    return f"{request.method} {request.url} {_token_identity(request.headers.get('authorization', ''))}"
+
+
+def offline_transport(inner, store: OfflineStore, retry_after: float = OFFLINE_RETRY):
+    """
+    Wrap an httpx transport with offline handling
+
+    After a connection failure the server counts as unreachable for
+    retry_after seconds: requests fail at once instead of each waiting for
+    its own timeout, and reads of SNAPSHOT_TABLES are answered from the
+    last good response (marked with an X-Offline-Snapshot header) where
+    there is one. Responses are saved by a background thread, so the
+    request doesn't wait on the disk.
+    """
+    import httpx
+
+    class OfflineTransport(httpx.BaseTransport):
+        def __init__(self):
+            self.inner = inner
+            self.store = store
+            self.retry_after = retry_after
+            self.offline_until = 0.0
+            self._snapshots = queue.Queue()
+            self._saver = None
+            self._saver_lock = threading.Lock()
+
+        @property
+        def online(self) -> bool:
+            return time.monotonic() >= self.offline_until
+
+        def handle_request(self, request):
+            if not self.online:
+                return self._offline_response(request, httpx.ConnectError("Offline", request=request))
+            was_offline = self.offline_until > 0
+            try:
+                response = self.inner.handle_request(request)
+            except httpx.TransportError as e:
+                if not was_offline:
+                    print(f"📴 Database unreachable, working offline: {e}")
+                self.offline_until = time.monotonic() + self.retry_after
+                return self._offline_response(request, e)
+
+            if was_offline:
+                print("📶 Database reachable again")
+                self.offline_until = 0.0
+            if response.status_code == 200 and _snapshot_table(request):
+                body = response.read()
+                headers = {name: value for name, value in response.headers.items()
+                           if name.lower() in ("content-type", "content-range")}
+                self._save_later(_snapshot_key(request), response.status_code, headers, body)
+            return response
+
+        def _save_later(self, *snapshot):
+            with self._saver_lock:
+                if self._saver is None:
+                    self._saver = threading.Thread(target=self._save_loop, name="OfflineSnapshots", daemon=True)
+                    self._saver.start()
+            self._snapshots.put(snapshot)
+
+        def _save_loop(self):
+            while True:
+                snapshot = self._snapshots.get()
+                try:
+                    self.store.save_snapshot(*snapshot)
+                except Exception as e:
+                    print(f"Error saving offline snapshot: {e}")
+
+        def _offline_response(self, request, error):
+            snapshot = self.store.load_snapshot(_snapshot_key(request)) if _snapshot_table(request) else None
+            if snapshot is None:
+                raise error
+            headers = dict(snapshot["headers"], **{"X-Offline-Snapshot": str(snapshot["synced_at"])})
+            return httpx.Response(snapshot["status"], headers=headers, content=snapshot["body"], request=request)
+
+        def close(self):
+            self.inner.close()
+
+    return OfflineTransport()
@@ -46,11 +46,25 @@ CREATE TABLE IF NOT EXISTS player_progress (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Existing databases: add the key that stops a replayed offline write being stored twice
+ALTER TABLE player_progress ADD COLUMN IF NOT EXISTS client_write_id TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_player_progress_client_write_id ON player_progress(client_write_id);
+
+-- Chat messages are journalled too (chat_messages is not created by this script)
+ALTER TABLE IF EXISTS chat_messages ADD COLUMN IF NOT EXISTS client_write_id TEXT;
+DO $$
+BEGIN
+    IF to_regclass('public.chat_messages') IS NOT NULL THEN
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_chat_messages_client_write_id ON chat_messages(client_write_id);
+    END IF;
+END $$;
+
 -- ==================== MAZES TABLE ====================
 CREATE TABLE IF NOT EXISTS mazes (
     id BIGSERIAL PRIMARY KEY,
     maze_name TEXT NOT NULL,
     maze_data JSONB NOT NULL,
+    content_hash TEXT,
     difficulty TEXT DEFAULT 'medium',
     width INTEGER NOT NULL,
     height INTEGER NOT NULL,
@@ -64,6 +78,9 @@ CREATE TABLE IF NOT EXISTS mazes (
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Existing databases: add the layout hash used to deduplicate saved mazes
+ALTER TABLE mazes ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
 -- ==================== MAZE RATINGS TABLE ====================
 CREATE TABLE IF NOT EXISTS maze_ratings (
     id BIGSERIAL PRIMARY KEY,
@@ -150,6 +167,7 @@ CREATE INDEX IF NOT EXISTS idx_mazes_public ON mazes(is_public);
 CREATE INDEX IF NOT EXISTS idx_mazes_difficulty ON mazes(difficulty);
 CREATE INDEX IF NOT EXISTS idx_mazes_play_count ON mazes(play_count DESC);
 CREATE INDEX IF NOT EXISTS idx_mazes_rating ON mazes(average_rating DESC);
+CREATE INDEX IF NOT EXISTS idx_mazes_content_hash ON mazes(content_hash);
 
 -- Maze ratings indexes
 CREATE INDEX IF NOT EXISTS idx_maze_ratings_maze_id ON maze_ratings(maze_id);
@@ -39,11 +39,25 @@ CREATE TABLE IF NOT EXISTS player_progress (
     timestamp TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Existing databases: add the key that stops a replayed offline write being stored twice
+ALTER TABLE player_progress ADD COLUMN IF NOT EXISTS client_write_id TEXT;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_player_progress_client_write_id ON player_progress(client_write_id);
+
+-- Chat messages are journalled too (chat_messages is not created by this script)
+ALTER TABLE IF EXISTS chat_messages ADD COLUMN IF NOT EXISTS client_write_id TEXT;
+DO $$
+BEGIN
+    IF to_regclass('public.chat_messages') IS NOT NULL THEN
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_chat_messages_client_write_id ON chat_messages(client_write_id);
+    END IF;
+END $$;
+
 -- ==================== MAZES TABLE ====================
 CREATE TABLE IF NOT EXISTS mazes (
     id BIGSERIAL PRIMARY KEY,
     maze_name TEXT NOT NULL,
     maze_data JSONB NOT NULL,
+    content_hash TEXT,
     difficulty TEXT DEFAULT 'medium',
     width INTEGER NOT NULL,
     height INTEGER NOT NULL,
@@ -54,6 +68,10 @@ CREATE TABLE IF NOT EXISTS mazes (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Existing databases: add the layout hash used to deduplicate saved mazes
+ALTER TABLE mazes ADD COLUMN IF NOT EXISTS content_hash TEXT;
+CREATE INDEX IF NOT EXISTS idx_mazes_content_hash ON mazes(content_hash);
+
 -- ==================== MAZE RATINGS TABLE ====================
 CREATE TABLE IF NOT EXISTS maze_ratings (
     id BIGSERIAL PRIMARY KEY,
@@ -19,6 +19,7 @@ def check_and_install_packages():
     """Check and install required packages"""
     required_packages = [
         "pygame",
+        "numpy",
         "supabase",
         "python-dotenv"
     ]
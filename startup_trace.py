@@ -0,0 +1,44 @@
+"""
+Startup trace for the Enhanced Maze Game
+Opt-in (MAZE_STARTUP_TRACE=1) report of the wall time spent in each startup
+phase: imports, SDL init, client creation, session restore, first frame
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+ENABLED = os.environ.get("MAZE_STARTUP_TRACE") == "1"
+
+# Trace clock starts when this module is first imported; import it first
+_start = time.perf_counter()
+_lock = threading.Lock()
+phases: List[Tuple[str, float, float]] = []  # (phase, seconds, finished at seconds since start)
+
+
+def record(name: str, seconds: float):
+    """Record a phase that took the given wall time"""
+    if not ENABLED:
+        return
+    finished = time.perf_counter() - _start
+    with _lock:
+        phases.append((name, seconds, finished))
+    where = "" if threading.current_thread() is threading.main_thread() else " (background)"
+    print(f"⏱️ {name}: {seconds * 1000:.1f}ms, done at {finished * 1000:.1f}ms{where}")
+
+
+def mark(name: str):
+    """Record a milestone: the time from the start of the trace until now"""
+    record(name, time.perf_counter() - _start)
+
+
+@contextmanager
+def phase(name: str):
+    """Time the enclosed block as one phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
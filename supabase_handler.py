@@ -1,23 +1,106 @@
 import os
-from supabase import create_client, Client
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
 import json
 from datetime import datetime
 import hashlib
 import time
-from dotenv import load_dotenv
 import threading
-import queue
+from collections import OrderedDict
+from maze_analysis import analyze_maze, validate_maze
+from maze_codec import encode_maze_text, load_maze_data, maze_hash
+from maze_generator import grid_to_maze, maze_to_grid
+import startup_trace
+from offline_store import default_store, offline_transport
+from write_queue import WriteBehindQueue
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Maze columns without the maze_data blob, for lookups that may not need the layout
+MAZE_SUMMARY_COLUMNS = "id, maze_name, difficulty, width, height, created_by, user_id, is_public, play_count, content_hash, created_at"
+
+# Decoded layouts kept in memory, keyed by content hash
+MAZE_CACHE_SIZE = 32
+
+# HTTP connection pool shared by every client in the process (see configure_http)
+HTTP_SETTINGS = {
+    "max_connections": 10,     # Open connections at once
+    "max_keepalive": 5,        # Idle connections kept warm for reuse
+    "keepalive_expiry": 30.0,  # Seconds an idle connection stays open
+    "timeout": 10.0,           # Seconds for reads, writes and waiting on the pool
+    "connect_timeout": 5.0     # Seconds to open a connection (including TLS)
+}
+
+_http_client = None
+_http_lock = threading.Lock()
+
+def configure_http(**settings):
+    """
+    Change the shared HTTP pool's limits and timeouts
+    
+    Takes the keys of HTTP_SETTINGS. Applies to clients created afterwards;
+    clients that already exist keep the pool they were given.
+    """
+    global _http_client
+    unknown = set(settings) - set(HTTP_SETTINGS)
+    if unknown:
+        raise ValueError(f"Unknown HTTP settings: {', '.join(sorted(unknown))}")
+    with _http_lock:
+        HTTP_SETTINGS.update(settings)
+        _http_client = None
+
+def shared_http_client():
+    """
+    The process-wide keep-alive HTTP client
+    
+    Every Supabase client made by create_client sends its requests through
+    this one connection pool, so connections (and their TLS handshakes) are
+    reused across handlers instead of each client opening its own.
+    """
+    global _http_client
+    with _http_lock:
+        if _http_client is None:
+            import httpx
+            import importlib.util
+            transport = httpx.HTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=HTTP_SETTINGS["max_connections"],
+                    max_keepalive_connections=HTTP_SETTINGS["max_keepalive"],
+                    keepalive_expiry=HTTP_SETTINGS["keepalive_expiry"]
+                ),
+                # Same as the clients supabase builds itself; HTTP/2 needs the h2 package
+                http2=importlib.util.find_spec("h2") is not None
+            )
+            _http_client = httpx.Client(
+                # Fails fast and answers reads from local snapshots while offline
+                transport=offline_transport(transport, default_store()),
+                timeout=httpx.Timeout(HTTP_SETTINGS["timeout"], connect=HTTP_SETTINGS["connect_timeout"]),
+                follow_redirects=True
+            )
+        return _http_client
+
+def create_client(url: str, key: str) -> "Client":
+    """
+    Create a Supabase client on the shared HTTP pool
+    
+    Each client keeps its own auth state; only the connections are shared.
+    The supabase package is only imported here, on first use.
+    """
+    from supabase import create_client as supabase_create_client, ClientOptions
+    return supabase_create_client(url, key, options=ClientOptions(httpx_client=shared_http_client()))
 
 class GameSupabaseHandler:
-    def __init__(self, url: str = None, key: str = None):
+    def __init__(self, url: str = None, key: str = None, lazy: bool = False):
         """
         Initialize Supabase client with authentication and game features
         
         Args:
             url: Supabase project URL (if None, will try to get from environment)
             key: Supabase anon key (if None, will try to get from environment)
+            lazy: Don't connect yet; the client is created and the session
+                restored by connect() or on first use of self.supabase
         """
+        from dotenv import load_dotenv
         load_dotenv()
 
         self.url = url or os.getenv('SUPABASE_URL')
@@ -26,14 +109,54 @@ class GameSupabaseHandler:
         if not self.url or not self.key:
             raise ValueError("Supabase URL and KEY must be provided either as parameters or environment variables")
         
-        self.supabase: Client = create_client(self.url, self.key)
+        self._client = None
+        self._connect_lock = threading.Lock()
         self.current_user = None
         self.current_session = None
         self.game_session_id = None
         self.game_start_time = None
+        self.maze_cache = OrderedDict()
+        
+        # Signed-in user's profile as (user id, profile), kept until it changes
+        self._profile_cache = None
+        self._profile_version = 0
+        self._profile_lock = threading.Lock()
+        
+        # Results, chat messages and ratings are sent in the background
+        self.writes = WriteBehindQueue(self)
         
-        # Try to restore existing session
-        self._restore_session()
+        if not lazy:
+            self.connect()
+    
+    @property
+    def supabase(self) -> "Client":
+        """Supabase client, connecting on first use"""
+        if self._client is None:
+            self.connect()
+        return self._client
+    
+    def is_connected(self) -> bool:
+        """Check if the client has been created (without creating it)"""
+        return self._client is not None
+    
+    def connect(self) -> "Client":
+        """
+        Create the client and restore any existing session, once
+        
+        Safe to call from a background thread; other callers wait for it
+        instead of connecting twice.
+        
+        Returns:
+            The Supabase client
+        """
+        with self._connect_lock:
+            if self._client is None:
+                with startup_trace.phase("client creation"):
+                    client = create_client(self.url, self.key)
+                with startup_trace.phase("session restore"):
+                    self._restore_session(client)
+                self._client = client
+        return self._client
     
     # ==================== AUTHENTICATION FUNCTIONS ====================
     
@@ -149,6 +272,7 @@ class GameSupabaseHandler:
             self.current_session = None
             self.game_session_id = None
             self.game_start_time = None
+            self._invalidate_profile()
             
             print("✅ Successfully signed out")
             return {"success": True, "message": "Successfully signed out"}
@@ -162,9 +286,9 @@ class GameSupabaseHandler:
         return self.current_user is not None and self.current_session is not None
     
     def get_current_user(self) -> Optional[Dict]:
-        """Get current user information"""
+        """Get current user information (the profile is cached until it changes)"""
         if self.current_user:
-            profile = self.get_user_profile()
+            profile = self._cached_profile()
             return {
                 "id": self.current_user.id,
                 "email": self.current_user.email,
@@ -193,10 +317,10 @@ class GameSupabaseHandler:
             print(f"Error getting session data: {e}")
             return {}
 
-    def _restore_session(self):
+    def _restore_session(self, client: "Client"):
         """Try to restore existing session"""
         try:
-            session = self.supabase.auth.get_session()
+            session = client.auth.get_session()
             if session and session.user:
                 self.current_user = session.user
                 self.current_session = session
@@ -225,28 +349,61 @@ class GameSupabaseHandler:
     # ==================== USER PROFILE FUNCTIONS ====================
     
     def get_user_profile(self) -> Optional[Dict]:
-        """Get current user's profile"""
+        """Get current user's profile (always fresh from the database; refreshes the cache)"""
         if not self.is_authenticated():
             return None
         
         try:
-            response = self.supabase.table("user_profiles").select("*").eq("user_id", self.current_user.id).execute()
-            return response.data[0] if response.data else None
+            return self._fetch_profile()
         except Exception as e:
             print(f"Error getting user profile: {e}")
             return None
     
+    def _fetch_profile(self) -> Optional[Dict]:
+        """Query the current user's profile and cache it; raises if the query fails"""
+        user_id = self.current_user.id
+        with self._profile_lock:
+            version = self._profile_version
+        response = self.supabase.table("user_profiles").select("*").eq("user_id", user_id).execute()
+        profile = response.data[0] if response.data else None
+        with self._profile_lock:
+            # Not if the profile changed (or the user signed out) while the query ran
+            if version == self._profile_version:
+                self._profile_cache = (user_id, profile)
+        return profile
+    
+    def _cached_profile(self) -> Optional[Dict]:
+        """Current user's profile, from the cache when there is one"""
+        if not self.is_authenticated():
+            return None
+        
+        cached = self._profile_cache
+        if cached is not None and cached[0] == self.current_user.id:
+            return cached[1]
+        return self.get_user_profile()
+    
+    def _invalidate_profile(self):
+        """Forget the cached profile; the next get_current_user() queries it again"""
+        with self._profile_lock:
+            self._profile_version += 1
+            self._profile_cache = None
+    
     def update_user_profile(self, updates: Dict[str, Any]) -> Optional[Dict]:
         """Update current user's profile"""
         if not self.is_authenticated():
             return None
         
+        self._invalidate_profile()
         try:
             response = self.supabase.table("user_profiles").update(updates).eq("user_id", self.current_user.id).execute()
             return response.data[0] if response.data else None
         except Exception as e:
             print(f"Error updating user profile: {e}")
             return None
+        finally:
+            # Again once the update is done, so a profile read while it was
+            # in flight (possibly the old row) isn't kept
+            self._invalidate_profile()
     
     # ==================== GAME SESSION FUNCTIONS ====================
     def cleanup_user_sessions(self) -> bool:
@@ -292,6 +449,7 @@ class GameSupabaseHandler:
                 
                 if user_response and user_response.user:
                     self.current_user = user_response.user
+                    self._invalidate_profile()
                     
                     # Create a minimal session object
                     from types import SimpleNamespace
@@ -403,29 +561,22 @@ class GameSupabaseHandler:
         if not self.game_session_id:
             return None
         
-        try:
-            session_duration = time.time() - self.game_start_time if self.game_start_time else 0
-            
-            update_data = {
-                "session_end": datetime.now().isoformat()
-                # Remove final_score and session_duration since these columns don't exist
-            }
-            
-            response = self.supabase.table("game_sessions").update(update_data).eq("id", self.game_session_id).execute()
-            
-            # Update user profile stats if authenticated
-            if self.is_authenticated() and completed:
-                self._update_user_stats(final_score, session_duration)
-            
-            self.game_session_id = None
-            self.game_start_time = None
-            
-            print(f"✅ Ended game session. Score: {final_score}, Duration: {session_duration:.1f}s")
-            return response.data[0] if response.data else None
-            
-        except Exception as e:
-            print(f"Error ending game session: {e}")
-            return None
+        session_id = self.game_session_id
+        session_duration = time.time() - self.game_start_time if self.game_start_time else 0
+        update_stats = self.is_authenticated() and completed
+        
+        update_data = {
+            "session_end": datetime.now().isoformat()
+            # Remove final_score and session_duration since these columns don't exist
+        }
+        
+        # Update user profile stats too if authenticated
+        self.writes.update("game_sessions", update_data, {"id": session_id},
+                           f"game session end (score {final_score}, {session_duration:.1f}s)",
+                           then=["_update_user_stats", [final_score, session_duration]] if update_stats else None)
+        self.game_session_id = None
+        self.game_start_time = None
+        return {"id": session_id, **update_data}
 
     
     def _update_user_stats(self, score: int, duration: float):
@@ -445,6 +596,7 @@ class GameSupabaseHandler:
             if profile.get("best_time") is None or duration < profile.get("best_time", float('inf')):
                 updates["best_time"] = duration
             
+            # Also drops the cached profile, so the new totals are shown
             self.update_user_profile(updates)
             
         except Exception as e:
@@ -453,7 +605,7 @@ class GameSupabaseHandler:
     # ==================== GAME PROGRESS FUNCTIONS ====================
     
     def save_game_progress(self, score, completion_time=None, maze_size=None, completed=True):
-        """Save game progress/results"""
+        """Save game progress/results (sent in the background; True once queued)"""
         if not self.is_authenticated():
             return False
         
@@ -480,41 +632,22 @@ class GameSupabaseHandler:
             if completed is not None:
                 progress_data['completed'] = completed
             
-            # Try to get current game session ID if it exists
-            if hasattr(self, 'current_session_id') and self.current_session_id:
-                progress_data['game_session_id'] = self.current_session_id
+            # Attach the current game session if there is one
+            if self.game_session_id:
+                progress_data['game_session_id'] = self.game_session_id
             
-            # Insert the progress data
-            result = self.supabase.table('player_progress').insert(progress_data).execute()
+            # Queue the insert; if the optional columns are rejected, retry without them
+            simple_columns = ('user_id', 'player_name', 'score', 'timestamp')
+            self.writes.insert('player_progress', progress_data, f"game progress (score {score})",
+                               fallback_columns=list(simple_columns))
+            return True
             
-            if result.data:
-                print(f"✅ Game progress saved: Score {score}")
-                return True
-            else:
-                print("❌ No data returned from progress save")
-                return False
-                
         except Exception as e:
             print(f"Error saving game progress: {e}")
-            # Try a simpler version without optional columns
-            try:
-                simple_data = {
-                    'user_id': user['id'],
-                    'player_name': user['username'],  # ADD THIS LINE HERE TOO
-                    'score': score,
-                    'timestamp': datetime.now().isoformat()
-                }
-                result = self.supabase.table('player_progress').insert(simple_data).execute()
-                if result.data:
-                    print(f"✅ Game progress saved (simple): Score {score}")
-                    return True
-            except Exception as e2:
-                print(f"Error with simple save: {e2}")
-            
             return False
     
     def save_guest_progress(self, player_name: str, score: int, completion_time: float = None, maze_size: str = None) -> bool:
-        """Save progress for guest players"""
+        """Save progress for guest players (sent in the background; True once queued)"""
         try:
             progress_data = {
                 'user_id': None,  # No user ID for guests
@@ -529,13 +662,8 @@ class GameSupabaseHandler:
             if maze_size is not None:
                 progress_data['maze_size'] = maze_size
             
-            result = self.supabase.table('player_progress').insert(progress_data).execute()
-            
-            if result.data:
-                print(f"✅ Guest progress saved: {player_name} - Score {score}")
-                return True
-            else:
-                return False
+            self.writes.insert('player_progress', progress_data, f"guest progress ({player_name}, score {score})")
+            return True
                 
         except Exception as e:
             print(f"Error saving guest progress: {e}")
@@ -601,28 +729,52 @@ class GameSupabaseHandler:
     # ==================== MAZE FUNCTIONS ====================
     
     def save_maze(self, maze_name: str, maze_data: List[List[str]], 
-                  difficulty: str = "medium", is_public: bool = True) -> Optional[Dict]:
+                  difficulty: str = None, is_public: bool = True, seed: int = None) -> Optional[Dict]:
         """
         Save a maze layout
         
+        Layouts are identified by content hash, so saving one the signed-in
+        user has already saved returns their record instead of inserting a copy.
+        
         Args:
             maze_name: Name for the maze
             maze_data: 2D array representing the maze
-            difficulty: Difficulty level
+            difficulty: Difficulty level (measured from the layout if None)
             is_public: Whether other users can access this maze
+            seed: Generator seed, stored in the maze header if known
             
         Returns:
             Saved maze record or None if failed
         """
         try:
+            # Reject broken layouts before they cost an upload
+            report = validate_maze(maze_data)
+            if not report["valid"]:
+                print(f"❌ Maze rejected: {'; '.join(report['errors'])}")
+                return None
+            
             current_user = self.get_current_user()
+            grid = maze_to_grid(maze_data)
+            content_hash = maze_hash(grid)
+            
+            # Same layout already saved by this user: hand back that record instead of a duplicate
+            existing = self.find_maze_by_hash(content_hash)
+            if existing:
+                existing["maze_data"] = grid_to_maze(grid)
+                self._cache_maze(content_hash, existing["maze_data"])
+                print(f"♻️ Maze already saved as: {existing['maze_name']}")
+                return existing
+            
+            if difficulty is None:
+                difficulty = analyze_maze(grid)['difficulty']
             
             maze_record = {
                 "maze_name": maze_name,
-                "maze_data": maze_data,  # Supabase handles JSON automatically
+                "maze_data": encode_maze_text(grid, seed=seed),  # Bit-packed, base64 text
+                "content_hash": content_hash,
                 "difficulty": difficulty,
-                "width": len(maze_data[0]) if maze_data else 0,
-                "height": len(maze_data) if maze_data else 0,
+                "width": grid.shape[1],
+                "height": grid.shape[0],
                 "created_by": current_user['username'] if current_user else "Anonymous",
                 "user_id": self.current_user.id if self.is_authenticated() else None,
                 "is_public": is_public,
@@ -635,7 +787,7 @@ class GameSupabaseHandler:
             
             if response.data:
                 print(f"✅ Saved maze: {maze_name}")
-                return response.data[0]
+                return self._decode_maze_record(response.data[0])
             
         except Exception as e:
             print(f"Error saving maze: {e}")
@@ -649,52 +801,94 @@ class GameSupabaseHandler:
         
         try:
             response = self.supabase.table("mazes").select("*").eq("user_id", self.current_user.id).order("created_at.desc").execute()
-            return response.data
+            return [self._decode_maze_record(maze) for maze in response.data]
         except Exception as e:
             print(f"Error getting user mazes: {e}")
             return []
     
-    def get_public_mazes(self, difficulty: str = None, limit: int = 20) -> List[Dict]:
+    def get_public_mazes(self, difficulty: str = None, limit: int = 20, include_data: bool = True) -> List[Dict]:
         """
         Get public mazes
         
         Args:
             difficulty: Filter by difficulty (optional)
             limit: Maximum number of mazes to return
+            include_data: Download each maze_data layout; browsers that only
+                need names and thumbnails can skip it
             
         Returns:
             List of public mazes
         """
         try:
-            query = self.supabase.table("mazes").select("*").eq("is_public", True)
+            columns = "*" if include_data else MAZE_SUMMARY_COLUMNS
+            query = self.supabase.table("mazes").select(columns).eq("is_public", True)
             
             if difficulty:
                 query = query.eq("difficulty", difficulty)
             
             response = query.order("play_count.desc").limit(limit).execute()
-            return response.data
+            return [self._decode_maze_record(maze) for maze in response.data]
             
         except Exception as e:
             print(f"Error getting public mazes: {e}")
             return []
     
-    def load_maze(self, maze_id: int) -> Optional[Dict]:
+    def get_maze_layouts(self, maze_ids: List[int]) -> Dict[int, List[str]]:
+        """
+        Download the layouts of several mazes in one request
+        
+        Args:
+            maze_ids: IDs of the mazes
+            
+        Returns:
+            Dictionary of maze ID to maze as a list of strings
+        """
+        if not maze_ids:
+            return {}
+        
+        try:
+            response = self.supabase.table("mazes").select("id, content_hash, maze_data").in_("id", list(maze_ids)).execute()
+            return {maze["id"]: self._decode_maze_record(maze)["maze_data"] for maze in response.data}
+        except Exception as e:
+            print(f"Error getting maze layouts: {e}")
+            return {}
+    
+    def load_maze(self, maze_id: int, content_hash: str = None) -> Optional[Dict]:
         """
         Load a specific maze and increment play count
         
         Args:
             maze_id: ID of the maze to load
+            content_hash: The maze's layout hash, if known (e.g. from a
+                summary listing); a layout cached under it isn't downloaded
             
         Returns:
             Maze data or None if not found
         """
         try:
-            # Get the maze
-            response = self.supabase.table("mazes").select("*").eq("id", maze_id).execute()
+            # One request either way: without the layout if it is cached, else the full row
+            cached = self._cached_maze(content_hash) if content_hash else None
+            columns = MAZE_SUMMARY_COLUMNS if cached is not None else "*"
+            response = self.supabase.table("mazes").select(columns).eq("id", maze_id).execute()
             
             if response.data:
                 maze = response.data[0]
                 
+                if cached is not None and maze.get("content_hash") == content_hash:
+                    maze["maze_data"] = cached
+                elif cached is not None:
+                    # The maze was changed since the hash was read
+                    layout = self.supabase.table("mazes").select("maze_data").eq("id", maze_id).execute()
+                    maze["maze_data"] = layout.data[0]["maze_data"]
+                    maze = self._decode_maze_record(maze)
+                else:
+                    maze = self._decode_maze_record(maze)
+                
+                report = validate_maze(maze["maze_data"])
+                if not report["valid"]:
+                    print(f"❌ Maze {maze_id} is not playable: {'; '.join(report['errors'])}")
+                    return None
+                
                 # Increment play count
                 self.supabase.table("mazes").update({
                     "play_count": maze.get("play_count", 0) + 1
@@ -707,6 +901,54 @@ class GameSupabaseHandler:
         
         return None
     
+    def find_maze_by_hash(self, content_hash: str) -> Optional[Dict]:
+        """
+        Find a maze the signed-in user saved with the given layout hash
+        
+        Other users' copies of the layout don't count: their name and
+        visibility aren't the caller's, and they aren't in get_user_mazes().
+        
+        Args:
+            content_hash: Hash from maze_codec.maze_hash
+            
+        Returns:
+            Maze record without maze_data, or None if no such maze (always
+            None when no one is signed in)
+        """
+        if not self.is_authenticated():
+            return None
+        
+        try:
+            response = (self.supabase.table("mazes").select(MAZE_SUMMARY_COLUMNS)
+                        .eq("content_hash", content_hash).eq("user_id", self.current_user.id)
+                        .limit(1).execute())
+            if response.data:
+                return response.data[0]
+        except Exception as e:
+            print(f"Error finding maze by hash: {e}")
+        return None
+    
+    def _cached_maze(self, content_hash: Optional[str]) -> Optional[List[str]]:
+        """Return a copy of a cached layout, refreshing its place in the cache"""
+        if content_hash not in self.maze_cache:
+            return None
+        self.maze_cache.move_to_end(content_hash)
+        return list(self.maze_cache[content_hash])
+    
+    def _cache_maze(self, content_hash: str, maze: List[str]):
+        self.maze_cache[content_hash] = list(maze)
+        self.maze_cache.move_to_end(content_hash)
+        while len(self.maze_cache) > MAZE_CACHE_SIZE:
+            self.maze_cache.popitem(last=False)
+    
+    def _decode_maze_record(self, record: Dict) -> Dict:
+        """Replace a record's stored maze_data (binary text or legacy JSON) with a list of strings"""
+        if record.get("maze_data") is not None:
+            record["maze_data"] = load_maze_data(record["maze_data"])
+            if record.get("content_hash"):
+                self._cache_maze(record["content_hash"], record["maze_data"])
+        return record
+    
     def rate_maze(self, maze_id: int, rating: int, comment: str = None) -> Optional[Dict]:
         """
         Rate a maze (1-5 stars)
@@ -717,7 +959,7 @@ class GameSupabaseHandler:
             comment: Optional comment
             
         Returns:
-            Rating record or None if failed
+            Rating record (sent in the background) or None if invalid
         """
         if not self.is_authenticated():
             return None
@@ -726,26 +968,18 @@ class GameSupabaseHandler:
             print("Rating must be between 1 and 5")
             return None
         
-        try:
-            rating_data = {
-                "maze_id": maze_id,
-                "user_id": self.current_user.id,
-                "rating": rating,
-                "comment": comment,
-                "created_at": datetime.now().isoformat()
-            }
-            
-            # Use upsert to allow users to update their rating
-            response = self.supabase.table("maze_ratings").upsert(rating_data).execute()
-            
-            # Update maze average rating
-            self._update_maze_rating(maze_id)
-            
-            return response.data[0] if response.data else None
-            
-        except Exception as e:
-            print(f"Error rating maze: {e}")
-            return None
+        rating_data = {
+            "maze_id": maze_id,
+            "user_id": self.current_user.id,
+            "rating": rating,
+            "comment": comment,
+            "created_at": datetime.now().isoformat()
+        }
+        
+        # Upsert so users can change their rating, then update the maze's average
+        self.writes.upsert("maze_ratings", rating_data, f"rating for maze {maze_id}",
+                           then=["_update_maze_rating", [maze_id]])
+        return rating_data
     
     def _update_maze_rating(self, maze_id: int):
         """Update average rating for a maze"""
@@ -1215,7 +1449,7 @@ class GameSupabaseHandler:
             backup_data = {
                 "user_id": self.current_user.id,
                 "game_session_id": self.game_session_id,
-                "maze_data": current_maze,
+                "maze_data": encode_maze_text(current_maze),
                 "player_x": player_position[0],
                 "player_y": player_position[1],
                 "player_angle": player_angle,
@@ -1232,7 +1466,7 @@ class GameSupabaseHandler:
             
             if response.data:
                 print("✅ Game state backed up")
-                return response.data[0]
+                return self._decode_maze_record(response.data[0])
             
         except Exception as e:
             print(f"Error backing up game state: {e}")
@@ -1248,7 +1482,11 @@ class GameSupabaseHandler:
             response = self.supabase.table("game_backups").select("*").eq("user_id", self.current_user.id).order("saved_at.desc").limit(1).execute()
             
             if response.data:
-                backup = response.data[0]
+                backup = self._decode_maze_record(response.data[0])
+                report = validate_maze(backup["maze_data"])
+                if not report["valid"]:
+                    print(f"❌ Game backup has a broken maze: {'; '.join(report['errors'])}")
+                    return None
                 print("✅ Game state restored")
                 return backup
             else:
@@ -1275,7 +1513,7 @@ class GameSupabaseHandler:
     # ==================== CHAT FUNCTIONS ====================
 
     def send_friend_message(self, friend_id: str, message: str) -> Optional[Dict]:
-        """Send a private message to a friend"""
+        """Send a private message to a friend (in the background; returns the queued message)"""
         if not self.is_authenticated():
             return None
         
@@ -1293,20 +1531,15 @@ class GameSupabaseHandler:
                 "timestamp": datetime.now().isoformat()
             }
             
-            response = self.supabase.table("chat_messages").insert(message_data).execute()
-            
-            if response.data:
-                print(f"✅ Message sent to friend")
-                return response.data[0]
-            
-            return None
+            self.writes.insert("chat_messages", message_data, "friend message")
+            return message_data
             
         except Exception as e:
             print(f"Error sending friend message: {e}")
             return None
 
     def send_game_message(self, message: str, game_session_id: str = None) -> Optional[Dict]:
-        """Send a message to game chat"""
+        """Send a message to game chat (in the background; returns the queued message)"""
         if not self.is_authenticated():
             return None
         
@@ -1328,20 +1561,15 @@ class GameSupabaseHandler:
                 "timestamp": datetime.now().isoformat()
             }
             
-            response = self.supabase.table("chat_messages").insert(message_data).execute()
-            
-            if response.data:
-                print(f"✅ Game message sent")
-                return response.data[0]
-            
-            return None
+            self.writes.insert("chat_messages", message_data, "game message")
+            return message_data
             
         except Exception as e:
             print(f"Error sending game message: {e}")
             return None
 
     def send_global_message(self, message: str) -> Optional[Dict]:
-        """Send a message to global chat"""
+        """Send a message to global chat (in the background; returns the queued message)"""
         if not self.is_authenticated():
             return None
         
@@ -1359,13 +1587,8 @@ class GameSupabaseHandler:
                 "timestamp": datetime.now().isoformat()
             }
             
-            response = self.supabase.table("chat_messages").insert(message_data).execute()
-            
-            if response.data:
-                print(f"✅ Global message sent")
-                return response.data[0]
-            
-            return None
+            self.writes.insert("chat_messages", message_data, "global message")
+            return message_data
             
         except Exception as e:
             print(f"Error sending global message: {e}")
@@ -1733,4 +1956,4 @@ if __name__ == "__main__":
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        print("Make sure to set SUPABASE_URL and SUPABASE_KEY environment variables")
\ No newline at end of file
+        print("Make sure to set SUPABASE_URL and SUPABASE_KEY environment variables")
\ No newline at end of file
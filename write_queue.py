@@ -0,0 +1,303 @@
+"""
+Write-behind queue for the Enhanced Maze Game
+Database writes are journalled locally and sent by one background thread,
+so the UI never waits on them and nothing is lost while offline; runs of
+inserts into the same table go as one request
+"""
+
+import atexit
+import threading
+import time
+import uuid
+from typing import Any, Dict, List
+
+from offline_store import ANON_OWNER, OFFLINE_RETRY, OfflineStore, default_store, is_offline_error
+
+# Most rows sent in one batched insert
+WRITE_BATCH_SIZE = 50
+
+# Seconds to keep sending queued writes when the program exits; anything
+# left stays in the journal and is sent by the next run
+WRITE_FLUSH_DEADLINE = 5.0
+
+# Seconds between looks at the journal when nothing new was queued here
+# (another process may have left writes, or given up the lease)
+JOURNAL_POLL = 2.0
+
+# Column holding each inserted row's idempotency key
+WRITE_ID_COLUMN = "client_write_id"
+
+
+class WriteBehindQueue:
+    """
+    Sends database writes from a background thread
+
+    Writes go into the offline journal first, so they survive being offline,
+    a crash or the program closing, and are sent in the order they were
+    made. Each write is journalled under the signed-in user (or as a guest
+    write) and only sent, and followed up, while that user is signed in
+    here or in another process sharing the journal. Inserts carry their
+    journal key in client_write_id and are sent as upserts that ignore
+    duplicates, so a write replayed after a lost response isn't stored
+    twice. Consecutive inserts of the same columns
+    into the same table are combined into one request; if that fails, the
+    rows are retried one at a time.
+
+    Jobs are plain data so they can be journalled:
+        {"op": "insert", "table", "row", "fallback_columns"}
+        {"op": "update", "table", "values", "match"}
+        {"op": "upsert", "table", "row"}
+    plus an optional "then": [handler method name, args] to run once the
+    write succeeds, and a "description" for log messages.
+    """
+
+    def __init__(self, handler, store: OfflineStore = None):
+        """
+        Args:
+            handler: GameSupabaseHandler whose client sends the writes
+            store: Journal to use (the shared default store if None)
+        """
+        self.handler = handler
+        self.store = store
+        self.writer_id = uuid.uuid4().hex
+        self.stats = {"queued": 0, "sent": 0, "failed": 0, "requests": 0}
+
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._offline = False
+        self._stopping = False
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Start the writer thread (it also sends writes left in the journal by earlier runs)"""
+        with self._start_lock:
+            if self._thread is None:
+                if self.store is None:
+                    self.store = default_store()
+                self._busy = True
+                self._thread = threading.Thread(target=self._run, name="WriteBehind", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def submit(self, job: Dict[str, Any]):
+        """Journal a write; returns at once"""
+        self.start()
+        self.store.append(job, self._owner())
+        self.stats["queued"] += 1
+        if not self._offline:
+            with self._idle:
+                self._busy = True
+            self._wake.set()
+
+    def insert(self, table: str, row: Dict[str, Any], description: str = None,
+               fallback_columns: List[str] = None):
+        """
+        Queue an insert
+
+        Args:
+            table: Table to insert into
+            row: Row to insert
+            description: What the row is, for log messages
+            fallback_columns: Columns to retry with if the row itself is rejected
+        """
+        self.submit({"op": "insert", "table": table, "row": row, "fallback_columns": fallback_columns,
+                     "description": description or f"{table} row"})
+
+    def update(self, table: str, values: Dict[str, Any], match: Dict[str, Any], description: str = None,
+               then: list = None):
+        """Queue an update of the rows matching every column in match"""
+        self.submit({"op": "update", "table": table, "values": values, "match": match, "then": then,
+                     "description": description or f"{table} update"})
+
+    def upsert(self, table: str, row: Dict[str, Any], description: str = None, then: list = None):
+        """Queue an upsert"""
+        self.submit({"op": "upsert", "table": table, "row": row, "then": then,
+                     "description": description or f"{table} row"})
+
+    def pending(self) -> int:
+        """Writes waiting in the journal for the signed-in user (made in any process)"""
+        return self.store.pending(self._owner()) if self.store is not None else 0
+
+    def _owner(self) -> str:
+        """Journal owner for writes made now: the signed-in user's id, or ANON_OWNER"""
+        if self.handler.is_authenticated():
+            return self.handler.current_user.id
+        return ANON_OWNER
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Wait until the writer has nothing left it can send
+
+        Returns:
+            True if the journal drained within the timeout
+        """
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._wake.set()
+        with self._idle:
+            while self._busy:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._idle.wait(remaining)
+        return not self.pending()
+
+    def close(self, timeout: float = WRITE_FLUSH_DEADLINE) -> bool:
+        """Send what can be sent before the deadline, then stop the writer thread"""
+        if self._thread is None or self._stopping:
+            return True
+        drained = self.flush(timeout)
+        if not drained:
+            print(f"⚠️ {self.pending()} database write(s) kept in the offline journal for next time")
+        self._stopping = True
+        self._wake.set()
+        self.store.release(self.writer_id)
+        return drained
+
+    def _pause(self, seconds: float):
+        """
+        Nothing to send for now: report idle and wait for the timeout
+
+        New writes end the wait early, except while offline, when they just
+        join the journal until it's time to try the server again.
+        """
+        self.store.release(self.writer_id)
+        with self._idle:
+            self._busy = False
+            self._idle.notify_all()
+        deadline = time.monotonic() + seconds
+        while not self._stopping:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            woken = self._wake.wait(remaining)
+            self._wake.clear()
+            if woken and not self._offline:
+                break
+
+    def _run(self):
+        while not self._stopping:
+            owner = self._owner()
+            entries = self.store.claim(self.writer_id, owner, WRITE_BATCH_SIZE)
+            if not entries:
+                self._pause(JOURNAL_POLL)
+                continue
+
+            try:
+                for group in self._groups(entries):
+                    if self._owner() != owner:
+                        # Signed out (or in as someone else): leave the rest for their owner
+                        break
+                    self._send(group)
+                    self.store.complete([entry["seq"] for entry in group])
+            except Exception as e:
+                # Offline: keep the rest of the journal, in order, and try again later
+                if not self._offline:
+                    print(f"📴 Database writes paused ({self.pending()} waiting): {e}")
+                self._offline = True
+                self._pause(OFFLINE_RETRY)
+                continue
+            if self._offline:
+                print("📶 Sending database writes made while offline")
+                self._offline = False
+
+    def _groups(self, entries: List[Dict[str, Any]]):
+        """Split entries into runs that can share a request (inserts of the same table and columns)"""
+        group = []
+        for entry in entries:
+            job = entry["job"]
+            if group:
+                first = group[0]["job"]
+                # A bulk insert needs every row to have the same columns
+                if not (job["op"] == first["op"] == "insert" and job["table"] == first["table"] and
+                        job["row"].keys() == first["row"].keys()):
+                    yield group
+                    group = []
+            group.append(entry)
+        if group:
+            yield group
+
+    def _send(self, group: List[Dict[str, Any]]):
+        """
+        Send one group; raises only if the server couldn't be reached
+
+        Writes the server rejects are reported and dropped, as before.
+        """
+        job = group[0]["job"]
+        if job["op"] == "insert":
+            self._insert(group)
+            return
+
+        try:
+            self.stats["requests"] += 1
+            table = self.handler.supabase.table(job["table"])
+            if job["op"] == "update":
+                query = table.update(job["values"])
+                for column, value in job["match"].items():
+                    query = query.eq(column, value)
+                query.execute()
+            else:
+                table.upsert(job["row"]).execute()
+        except Exception as e:
+            if is_offline_error(e):
+                raise
+            self.stats["failed"] += 1
+            print(f"Error saving {job['description']}: {e}")
+            return
+
+        self.stats["sent"] += 1
+        print(f"✅ Saved {job['description']}")
+        if job.get("then"):
+            method, args = job["then"]
+            getattr(self.handler, method)(*args)
+
+    def _insert(self, group: List[Dict[str, Any]]):
+        table = group[0]["job"]["table"]
+        if len(group) > 1:
+            try:
+                self._insert_rows(table, [self._keyed(entry) for entry in group])
+                self.stats["sent"] += len(group)
+                print(f"✅ Saved {len(group)} {table} rows")
+                return
+            except Exception as e:
+                if is_offline_error(e):
+                    raise
+                print(f"Batched insert into {table} failed, sending rows one at a time: {e}")
+
+        for entry in group:
+            self._insert_one(entry)
+
+    def _insert_one(self, entry: Dict[str, Any]):
+        job = entry["job"]
+        # The whole row, then just the fallback columns; both keep client_write_id,
+        # since an insert without it could be stored twice when replayed
+        attempts = [self._keyed(entry)]
+        if job.get("fallback_columns"):
+            row = {column: job["row"][column] for column in job["fallback_columns"]}
+            attempts.append(dict(row, **{WRITE_ID_COLUMN: entry["write_id"]}))
+
+        for row in attempts:
+            try:
+                self._insert_rows(job["table"], [row])
+            except Exception as e:
+                if is_offline_error(e):
+                    raise
+                print(f"Error saving {job['description']}: {e}")
+                continue
+            self.stats["sent"] += 1
+            print(f"✅ Saved {job['description']}")
+            return
+        self.stats["failed"] += 1
+
+    def _insert_rows(self, table: str, rows: List[Dict[str, Any]]):
+        self.stats["requests"] += 1
+        # A replay of a row that is already stored is ignored
+        self.handler.supabase.table(table).upsert(rows, on_conflict=WRITE_ID_COLUMN,
+                                                  ignore_duplicates=True).execute()
+
+    @staticmethod
+    def _keyed(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(entry["job"]["row"], **{WRITE_ID_COLUMN: entry["write_id"]})